@@ -0,0 +1,108 @@
+"""
+Shared setup of the benchmark scripts.
+
+Importing this module puts `src/` on the import path, so the scripts can
+import `generate_iconik_models` afterwards, and limits the generator's log
+output to warnings.
+"""
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPECS_DIR = os.path.join(ROOT_DIR, "examples", "models", "_specs")
+SCRIPT = os.path.join(ROOT_DIR, "src", "generate_iconik_models.py")
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+logging.getLogger("generate_iconik_models").setLevel(logging.WARNING)
+
+# pylint: disable=wrong-import-position
+from generate_iconik_models import extract_schemas, load_specs
+
+
+def make_parser(doc, repeat):
+    """
+    Create the argument parser of a benchmark script.
+
+    Args:
+        doc: Docstring of the script, whose first line is the description
+        repeat: Default number of timed runs for `--repeat`
+
+    Returns:
+        Argument parser with the `--repeat` option
+    """
+    parser = argparse.ArgumentParser(description=doc.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=repeat)
+    return parser
+
+
+def load_fixture_specs():
+    """
+    Load the 14 fixture specifications in `examples/models/_specs`.
+
+    Returns:
+        Dictionary mapping spec names to their parsed JSON content
+    """
+    return load_specs(SPECS_DIR)
+
+
+def load_fixture_schemas():
+    """
+    Load the component schemas of the fixture specifications.
+
+    Returns:
+        Dictionary mapping spec names to their component schemas
+    """
+    return extract_schemas(load_fixture_specs())
+
+
+def run_generator(*args):
+    """
+    Run the generator script in a fresh interpreter.
+
+    Args:
+        *args: Command-line arguments
+    """
+    subprocess.run(
+        [sys.executable, SCRIPT, *args], check=True, capture_output=True
+    )
+
+
+def time_median(run, repeat, setup=None):
+    """
+    Time a function over several runs.
+
+    Args:
+        run: Function to time; it takes the result of `setup` if one is
+            given and no arguments otherwise
+        repeat: Number of timed runs
+        setup: Function called before each run outside the timing, or None
+
+    Returns:
+        Tuple of (median run time in milliseconds, result of the last run)
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        result = run(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def print_timings(timings, digits=1):
+    """
+    Print labelled run times as a table.
+
+    Args:
+        timings: Dictionary mapping labels to run times in milliseconds
+        digits: Number of decimal places
+    """
+    width = max(map(len, timings))
+    for label, elapsed in timings.items():
+        print(f"{label:<{width}} {elapsed:8.{digits}f} ms")
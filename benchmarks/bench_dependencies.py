@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark model dependency collection on synthetic specifications.
+
+Each synthetic specification has N object schemas named `Schema<i>`, so many
+names are substrings of others (`Schema1` in `Schema10`), with a mix of
+`$ref`, array, map and oneOf fields pointing at random schemas. The
+ref-index based `collect_model_dependencies` is compared with the former
+substring scan, which is only run up to `--legacy-max` schemas because it is
+quadratic. Run it from the repository root:
+
+    python benchmarks/bench_dependencies.py [--sizes 1000 10000 20000]
+        [--repeat N]
+"""
+import functools
+import random
+
+from _common import make_parser, time_median
+
+from generate_iconik_models import (
+    Model,
+    collect_model_dependencies,
+    generate_model_field,
+)
+
+
+def make_schemas(size, fields=5, seed=0):
+    """
+    Build a synthetic set of component schemas.
+
+    Args:
+        size: Number of schemas
+        fields: Number of fields per schema
+        seed: Random seed
+
+    Returns:
+        Dictionary mapping schema names to schema definitions
+    """
+    rng = random.Random(seed)
+
+    def ref():
+        return {"$ref": f"#/components/schemas/Schema{rng.randrange(size)}"}
+
+    makers = [
+        ref,
+        lambda: {"type": "array", "items": ref()},
+        lambda: {"type": "object", "additionalProperties": ref()},
+        lambda: {"oneOf": [ref(), ref(), {"type": "string"}]},
+        lambda: {"type": "string"},
+    ]
+    return {
+        f"Schema{i}": {
+            "type": "object",
+            "properties": {
+                f"field_{j}": rng.choice(makers)() for j in range(fields)
+            },
+        }
+        for i in range(size)
+    }
+
+
+def make_models(schemas):
+    """
+    Turn schemas into model definitions like `generate_spec_models` does.
+
+    Args:
+        schemas: Dictionary mapping schema names to schema definitions
+
+    Returns:
+        List of unsorted model definitions
+    """
+    model_names = set(schemas)
+    models = []
+    for name, schema in schemas.items():
+        fields = [
+            generate_model_field(field_name, field_schema, [], model_names)
+            for field_name, field_schema in schema["properties"].items()
+        ]
+        models.append(Model(
+            name, "", {field.name: field for field in fields}, {}, None
+        ))
+    return models
+
+
+def legacy_collect_model_dependencies(models):
+    """
+    Collect dependencies with the former substring scan.
+
+    Args:
+        models: List of model definitions
+
+    Returns:
+        Dictionary mapping model names to sets of dependent model names
+    """
+    dependencies = {}
+    for model in models:
+        model_name = model.name
+        dependencies[model_name] = set()
+        for field in model.fields.values():
+            type_hint = field.render()
+            for other_model in models:
+                other_name = other_model.name
+                if other_name != model_name and other_name in type_hint:
+                    dependencies[model_name].add(other_name)
+    return dependencies
+
+
+def main():
+    """Run the benchmark and print a table."""
+    parser = make_parser(__doc__, repeat=1)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[500, 2000, 10000, 20000]
+    )
+    parser.add_argument("--legacy-max", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(
+        f"{'schemas':>8} {'fields':>8} {'edges':>8} {'ref index':>12} "
+        f"{'substring':>12} {'false edges':>12}"
+    )
+    for size in args.sizes:
+        models = make_models(make_schemas(size))
+        elapsed, dependencies = time_median(
+            functools.partial(collect_model_dependencies, models), args.repeat
+        )
+        edges = sum(map(len, dependencies.values()))
+        row = (
+            f"{size:>8} {size * 5:>8} {edges:>8} {elapsed:>9.1f} ms"
+        )
+
+        if size <= args.legacy_max:
+            legacy_elapsed, legacy = time_median(
+                functools.partial(legacy_collect_model_dependencies, models),
+                args.repeat,
+            )
+            false_edges = sum(map(len, legacy.values())) - edges
+            assert all(
+                dependencies[name] <= legacy[name] for name in dependencies
+            )
+            row += f" {legacy_elapsed:>9.1f} ms {false_edges:>12}"
+        else:
+            row += f" {'skipped':>12} {'-':>12}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark the backends that write model code on the fixture specifications.
+
+The models of the 14 fixtures in `examples/models/_specs` are written with
+the former per-module template compilation, the cached template rendered
+to a string, the cached template streamed to the file and the direct
+emitter. Each backend writes to an in-memory file, and all of them must
+produce the same code. Compiling the template from source is also compared
+with loading it from the bytecode cache. Run it from the repository root:
+
+    python benchmarks/bench_emitters.py [--repeat N]
+"""
+import functools
+import io
+import tempfile
+
+from _common import (
+    load_fixture_schemas,
+    make_parser,
+    print_timings,
+    time_median,
+)
+from jinja2 import (
+    DictLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+)
+
+from generate_iconik_models import (
+    MODEL_TEMPLATE,
+    MODEL_TEMPLATE_NAME,
+    emit_model_code,
+    generate_model_code,
+    generate_models,
+    render_model_code,
+)
+
+
+def legacy_emit(models, fp):
+    """
+    Write the models' code with the former per-module template compilation.
+
+    Args:
+        models: List of model definitions
+        fp: Text file to write the code to
+    """
+    env = Environment(loader=FileSystemLoader("."))
+    fp.write(env.from_string(MODEL_TEMPLATE).render(models=models))
+
+
+def string_emit(models, fp):
+    """
+    Render the cached template to one string before writing it.
+
+    Args:
+        models: List of model definitions
+        fp: Text file to write the code to
+    """
+    fp.write(generate_model_code(models))
+
+
+def emit_all(emit, models_by_spec):
+    """
+    Write the models of every specification.
+
+    Args:
+        emit: Function taking (models, fp)
+        models_by_spec: Dictionary mapping spec names to their models
+
+    Returns:
+        Dictionary mapping spec names to their code
+    """
+    outputs = {}
+    for spec_name, models in models_by_spec.items():
+        fp = io.StringIO()
+        emit(models, fp)
+        outputs[spec_name] = fp.getvalue()
+    return outputs
+
+
+def make_environment(bytecode_cache_dir):
+    """
+    Create a fresh environment for the model template.
+
+    Args:
+        bytecode_cache_dir: Directory of the bytecode cache, or None to
+            compile the template from source
+
+    Returns:
+        Jinja2 environment that has not loaded the template yet
+    """
+    return Environment(
+        loader=DictLoader({MODEL_TEMPLATE_NAME: MODEL_TEMPLATE}),
+        bytecode_cache=(
+            FileSystemBytecodeCache(bytecode_cache_dir)
+            if bytecode_cache_dir else None
+        ),
+    )
+
+
+def load_template(env):
+    """
+    Load the model template in an environment.
+
+    Args:
+        env: Environment from `make_environment`
+
+    Returns:
+        The model template
+    """
+    return env.get_template(MODEL_TEMPLATE_NAME)
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    args = make_parser(__doc__, repeat=20).parse_args()
+
+    models_by_spec = generate_models(load_fixture_schemas())
+    print(
+        f"Modules: {len(models_by_spec)}, models: "
+        f"{sum(map(len, models_by_spec.values()))}"
+    )
+
+    expected = None
+    timings = {}
+    for label, emit in (
+        ("former (compile per module)", legacy_emit),
+        ("cached template, string", string_emit),
+        ("cached template, streamed", render_model_code),
+        ("direct emitter", emit_model_code),
+    ):
+        timings[label], outputs = time_median(
+            functools.partial(emit_all, emit, models_by_spec), args.repeat
+        )
+        expected = expected or outputs
+        assert outputs == expected, label
+    print_timings(timings)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Fill the bytecode cache before timing the warm loads
+        load_template(make_environment(tmp_dir))
+        timings = {
+            label: time_median(
+                load_template,
+                args.repeat,
+                setup=functools.partial(make_environment, bytecode_cache_dir),
+            )[0]
+            for label, bytecode_cache_dir in (
+                ("template compile", None),
+                ("template bytecode cache load", tmp_dir),
+            )
+        }
+    print_timings(timings, digits=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Compare full, incremental and no-op regeneration of the fixture package.
+
+The package is generated once from the 14 fixtures in
+`examples/models/_specs`. Then each scenario is timed: regenerating every
+module with `--force`, a no-op run whose inputs are all unchanged, and a
+run after one component schema of one specification changed. Every run is
+a fresh interpreter, as on the command line. Run it from the repository
+root:
+
+    python benchmarks/bench_incremental.py [--repeat N] [--format-code]
+"""
+import functools
+import itertools
+import json
+import os
+import shutil
+import tempfile
+
+from _common import (
+    SPECS_DIR,
+    make_parser,
+    print_timings,
+    run_generator,
+    time_median,
+)
+
+
+def touch_schema(spec_dir, spec_name, revisions):
+    """
+    Change one component schema of a specification.
+
+    Args:
+        spec_dir: Directory of the specifications
+        spec_name: Name of the specification to change
+        revisions: Iterator of the numbers written into the schema's
+            description
+    """
+    path = os.path.join(spec_dir, f"{spec_name}.json")
+    with open(path, "r", encoding="utf-8") as fp:
+        spec = json.load(fp)
+    schema = next(iter(spec["components"]["schemas"].values()))
+    schema["description"] = f"Revision {next(revisions)}"
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(spec, fp)
+
+
+def main():
+    """Run the benchmark and print a table."""
+    parser = make_parser(__doc__, repeat=5)
+    parser.add_argument("--format-code", action="store_true")
+    args = parser.parse_args()
+    extra_args = ["--format-code"] if args.format_code else []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        spec_dir = os.path.join(tmp_dir, "_specs")
+        shutil.copytree(SPECS_DIR, spec_dir)
+        generate = functools.partial(
+            run_generator,
+            "--spec-dir",
+            spec_dir,
+            "-o",
+            os.path.join(tmp_dir, "models"),
+            *extra_args,
+        )
+        generate()
+
+        timings = {
+            "full (--force)": time_median(
+                functools.partial(generate, "--force"), args.repeat
+            )[0],
+            "no-op": time_median(generate, args.repeat)[0],
+            "one spec changed": time_median(
+                lambda _: generate(),
+                args.repeat,
+                setup=functools.partial(
+                    touch_schema, spec_dir, "jobs", itertools.count()
+                ),
+            )[0],
+        }
+
+    print_timings(timings)
+
+
+if __name__ == "__main__":
+    main()
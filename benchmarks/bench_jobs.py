@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Measure how model generation scales with the number of worker processes.
+
+The package of the 14 fixtures in `examples/models/_specs` is generated in
+memory with `generate(..., jobs=N)` for N from 1 to the number of CPUs, and
+every run must return the same sources as the serial one. Each timing
+includes starting the process pool. Run it from the repository root:
+
+    python benchmarks/bench_jobs.py [--repeat N] [--max-jobs N]
+        [--emitter {jinja,direct}]
+"""
+import functools
+import os
+
+from _common import load_fixture_specs, make_parser, time_median
+
+from generate_iconik_models import EMITTERS, generate
+
+
+def time_generate(specs, jobs, emit_models, repeat):
+    """
+    Time generating the package in memory.
+
+    Args:
+        specs: Dictionary mapping spec names to their parsed JSON content
+        jobs: Number of worker processes
+        emit_models: Function writing a module's model code
+        repeat: Number of timed runs
+
+    Returns:
+        Tuple of (median run time in milliseconds, sources of the last run)
+    """
+    return time_median(
+        functools.partial(generate, specs, emit_models=emit_models, jobs=jobs),
+        repeat,
+    )
+
+
+def main():
+    """Run the benchmark and print a table."""
+    parser = make_parser(__doc__, repeat=5)
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--emitter", choices=sorted(EMITTERS), default="jinja")
+    args = parser.parse_args()
+
+    specs = load_fixture_specs()
+    emit_models = EMITTERS[args.emitter]
+    print(f"CPUs: {os.cpu_count()}, emitter: {args.emitter}")
+    print(f"{'jobs':>4} {'ms':>9} {'speedup':>8}")
+
+    serial_ms, expected = time_generate(specs, 1, emit_models, args.repeat)
+    print(f"{1:>4} {serial_ms:>9.1f} {1:>8.2f}")
+    for jobs in range(2, max(args.max_jobs, 2) + 1):
+        elapsed, sources = time_generate(
+            specs, jobs, emit_models, args.repeat
+        )
+        assert sources == expected, jobs
+        print(f"{jobs:>4} {elapsed:>9.1f} {serial_ms / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold and warm loads of the example specifications.
+
+A cold load parses the JSON of all 14 fixture specifications in
+`examples/models/_specs`; a warm load reads the same structures from the
+parsed-spec cache. Run it from the repository root:
+
+    python benchmarks/bench_parsed_cache.py [--repeat N]
+"""
+import functools
+import os
+import tempfile
+
+from _common import SPECS_DIR, make_parser, print_timings, time_median
+
+from generate_iconik_models import json_loads, load_specs
+
+
+def time_load(parsed_cache_dir, repeat):
+    """
+    Time `load_specs` over all fixture specifications.
+
+    Args:
+        parsed_cache_dir: Directory of the parsed-spec cache, or None
+        repeat: Number of timed runs
+
+    Returns:
+        Median run time in milliseconds
+    """
+    return time_median(
+        functools.partial(
+            load_specs, SPECS_DIR, parsed_cache_dir=parsed_cache_dir
+        ),
+        repeat,
+    )[0]
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    args = make_parser(__doc__, repeat=20).parse_args()
+
+    with tempfile.TemporaryDirectory() as parsed_cache_dir:
+        specs = load_specs(SPECS_DIR, parsed_cache_dir=parsed_cache_dir)
+        cold = time_load(None, args.repeat)
+        warm = time_load(parsed_cache_dir, args.repeat)
+        assert load_specs(SPECS_DIR, parsed_cache_dir=parsed_cache_dir) == specs
+        cache_bytes = sum(
+            os.path.getsize(os.path.join(parsed_cache_dir, name))
+            for name in os.listdir(parsed_cache_dir)
+        )
+
+    print(f"Specifications: {len(specs)} ({json_loads.__module__} parser)")
+    print(f"Parsed cache:   {cache_bytes} bytes")
+    print_timings({"cold": cold, "warm": warm})
+    print(f"speedup: {cold / warm:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
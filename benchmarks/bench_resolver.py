@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark the schema reference resolver on the fixture specifications.
+
+Every component schema of the 14 fixtures in `examples/models/_specs` is
+resolved with the former recursive resolver, the memoized resolver that
+copies each use site, and the memoized resolver that shares subtrees. The
+former resolver never terminates on cyclic references, so those schemas
+are counted and left out of its timings. A synthetic chain of diamonds,
+where every schema references the next one twice, shows the cost of
+re-resolving shared references. Run it from the repository root:
+
+    python benchmarks/bench_resolver.py [--repeat N] [--depth N]
+"""
+import functools
+
+from _common import (
+    load_fixture_schemas,
+    make_parser,
+    print_timings,
+    time_median,
+)
+
+from generate_iconik_models import resolve_schema_references
+
+
+def legacy_resolve_schema_references(schema, all_schemas):
+    """
+    Resolve $ref references with the former recursive resolver.
+
+    Args:
+        schema: The schema to resolve references in
+        all_schemas: Dictionary of all schemas, keyed by name
+
+    Returns:
+        Schema with references resolved
+    """
+    if not isinstance(schema, dict):
+        return schema
+
+    resolved = {}
+    for key, value in schema.items():
+        if key == "$ref" and isinstance(value, str):
+            ref_parts = value.split("/")
+            if (
+                ref_parts[0] == "#" and ref_parts[1] == "components"
+                and ref_parts[2] == "schemas"
+            ):
+                ref_name = ref_parts[3]
+                if ref_name in all_schemas:
+                    resolved.update(
+                        legacy_resolve_schema_references(
+                            all_schemas[ref_name], all_schemas
+                        )
+                    )
+                else:
+                    resolved[key] = value
+            else:
+                resolved[key] = value
+        elif isinstance(value, dict):
+            resolved[key] = legacy_resolve_schema_references(value, all_schemas)
+        elif isinstance(value, list):
+            resolved[key] = [(
+                legacy_resolve_schema_references(item, all_schemas)
+                if isinstance(item, dict) else item
+            ) for item in value]
+        else:
+            resolved[key] = value
+
+    return resolved
+
+
+def find_cyclic_schemas(spec_schemas):
+    """
+    Find the schemas the former resolver cannot resolve.
+
+    Args:
+        spec_schemas: Dictionary mapping schema names to schema definitions
+
+    Returns:
+        Set of schema names that exceed the recursion limit
+    """
+    cyclic = set()
+    for schema_name, schema in spec_schemas.items():
+        try:
+            legacy_resolve_schema_references(schema, spec_schemas)
+        except RecursionError:
+            cyclic.add(schema_name)
+    return cyclic
+
+
+def make_diamonds(depth):
+    """
+    Build schemas where each one references the next one twice.
+
+    Args:
+        depth: Number of schemas in the chain
+
+    Returns:
+        Dictionary mapping schema names to schema definitions
+    """
+    schemas = {f"Schema{depth}": {"type": "string"}}
+    for i in range(depth):
+        ref = {"$ref": f"#/components/schemas/Schema{i + 1}"}
+        schemas[f"Schema{i}"] = {
+            "type": "object",
+            "properties": {"left": dict(ref), "right": dict(ref)},
+        }
+    return schemas
+
+
+def resolve_all(resolve, spec_schemas, names):
+    """
+    Resolve the named schemas of every specification.
+
+    Args:
+        resolve: Function taking (schema, all_schemas, memo)
+        spec_schemas: Dictionary mapping spec names to their schemas
+        names: Dictionary mapping spec names to the schema names to resolve
+    """
+    for spec_name, schemas in spec_schemas.items():
+        memo = {}
+        for schema_name in names[spec_name]:
+            resolve(schemas[schema_name], schemas, memo)
+
+
+def time_resolver(resolve, spec_schemas, names, repeat):
+    """
+    Time resolving the named schemas of every specification.
+
+    Args:
+        resolve: Function taking (schema, all_schemas, memo)
+        spec_schemas: Dictionary mapping spec names to their schemas
+        names: Dictionary mapping spec names to the schema names to resolve
+        repeat: Number of timed runs
+
+    Returns:
+        Median run time in milliseconds
+    """
+    return time_median(
+        functools.partial(resolve_all, resolve, spec_schemas, names), repeat
+    )[0]
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    parser = make_parser(__doc__, repeat=10)
+    parser.add_argument("--depth", type=int, default=14)
+    args = parser.parse_args()
+
+    spec_schemas = load_fixture_schemas()
+    cyclic = {
+        spec_name: find_cyclic_schemas(schemas)
+        for spec_name, schemas in spec_schemas.items()
+    }
+    acyclic = {
+        spec_name: [name for name in schemas if name not in cyclic[spec_name]]
+        for spec_name, schemas in spec_schemas.items()
+    }
+
+    def legacy(schema, all_schemas, _memo):
+        return legacy_resolve_schema_references(schema, all_schemas)
+
+    def copied(schema, all_schemas, memo):
+        return resolve_schema_references(schema, all_schemas, memo)
+
+    def shared(schema, all_schemas, memo):
+        return resolve_schema_references(schema, all_schemas, memo, True)
+
+    for spec_name, names in acyclic.items():
+        schemas = spec_schemas[spec_name]
+        memo = {}
+        for name in names:
+            expected = legacy_resolve_schema_references(schemas[name], schemas)
+            assert copied(schemas[name], schemas, memo) == expected
+            assert shared(schemas[name], schemas, memo) == expected
+
+    print(
+        f"Schemas: {sum(map(len, spec_schemas.values()))}, "
+        f"{sum(map(len, cyclic.values()))} with cyclic references"
+    )
+    print_timings({
+        label: time_resolver(resolve, spec_schemas, names, args.repeat)
+        for label, resolve, names in (
+            ("former (acyclic only)", legacy, acyclic),
+            ("memoized (acyclic only)", copied, acyclic),
+            ("memoized, shared (acyclic only)", shared, acyclic),
+            ("memoized (all)", copied, spec_schemas),
+            ("memoized, shared (all)", shared, spec_schemas),
+        )
+    })
+
+    diamonds = {"diamonds": make_diamonds(args.depth)}
+    names = {"diamonds": ["Schema0"]}
+    print(f"Diamond chain of depth {args.depth}:")
+    print_timings({
+        label: time_resolver(resolve, diamonds, names, args.repeat)
+        for label, resolve in (
+            ("former", legacy),
+            ("memoized", copied),
+            ("memoized, shared", shared),
+        )
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Compare generated packages with and without `--shared-models`.
+
+Both packages are generated from the 14 fixtures in `examples/models/_specs`
+and then imported in fresh interpreters to measure code size, the number of
+model classes, import time and peak resident memory. Run it from the
+repository root:
+
+    python benchmarks/bench_shared_models.py [--repeat N]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from _common import SPECS_DIR, make_parser, run_generator
+
+IMPORT_SCRIPT = """
+import importlib, json, pkgutil, resource, sys, time
+start = time.perf_counter()
+import models
+for module in pkgutil.iter_modules(models.__path__):
+    importlib.import_module(f"models.{module.name}")
+elapsed = time.perf_counter() - start
+classes = {
+    id(value)
+    for name, module in sys.modules.items() if name.startswith("models.")
+    for value in vars(module).values()
+    if isinstance(value, type) and value.__module__ == name
+}
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "maxrss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "classes": len(classes),
+}))
+"""
+
+
+def measure(package_dir, repeat):
+    """
+    Import a generated package in fresh interpreters.
+
+    Args:
+        package_dir: Directory containing the `models` package
+        repeat: Number of interpreters to start
+
+    Returns:
+        Dictionary of median measurements plus the code size in bytes
+    """
+    runs = [
+        json.loads(subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            check=True,
+            capture_output=True,
+            cwd=package_dir,
+            text=True,
+        ).stdout)
+        for _ in range(repeat)
+    ]
+    result = {
+        key: statistics.median(run[key] for run in runs) for key in runs[0]
+    }
+    models_dir = os.path.join(package_dir, "models")
+    result["bytes"] = sum(
+        os.path.getsize(os.path.join(models_dir, name))
+        for name in os.listdir(models_dir) if name.endswith(".py")
+    )
+    return result
+
+
+def main():
+    """Run the benchmark and print a table."""
+    args = make_parser(__doc__, repeat=5).parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {}
+        for label, extra_args in (("per-spec", ()),
+                                  ("shared", ("--shared-models",))):
+            package_dir = os.path.join(tmp_dir, label)
+            run_generator(
+                "--spec-dir",
+                SPECS_DIR,
+                "--no-cache",
+                "-o",
+                os.path.join(package_dir, "models"),
+                *extra_args,
+            )
+            results[label] = measure(package_dir, args.repeat)
+
+    print(f"{'':<10} {'bytes':>9} {'classes':>8} {'import ms':>10} "
+          f"{'max RSS KiB':>12}")
+    for label, result in results.items():
+        print(
+            f"{label:<10} {result['bytes']:>9} {result['classes']:>8} "
+            f"{result['import_ms']:>10.1f} {result['maxrss_kib']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark model validation with the default and a throughput type mapping.
+
+A synthetic file schema with URL, date-time, UUID and plain string fields is
+generated twice: with the default type mapping and with overrides that map
+every string format to `str`. Both modules are imported and validate the
+same payloads with `model_validate`. Run it from the repository root:
+
+    python benchmarks/bench_type_mapping.py [--objects N] [--repeat N]
+"""
+import functools
+import importlib.util
+import os
+import sys
+import tempfile
+import uuid
+
+from _common import make_parser, time_median
+
+from generate_iconik_models import (
+    TypeMapping,
+    create_module_file,
+    generate_spec_models,
+)
+
+THROUGHPUT_OVERRIDES = {
+    "string:uri": "str",
+    "string:url": "str",
+    "string:date-time": "str",
+    "string:date": "str",
+    "string:uuid": "str",
+}
+
+FORMATS = {
+    "url": ("uri", lambda i: f"https://cdn.example.com/files/{i}.mp4"),
+    "date": ("date-time", lambda i: f"2024-01-{i % 28 + 1:02d}T12:00:00Z"),
+    "id": ("uuid", lambda i: str(uuid.UUID(int=i))),
+    "name": (None, lambda i: f"file-{i}.mp4"),
+}
+
+
+def make_schemas(fields):
+    """
+    Build a file schema with `fields` properties of every format.
+
+    Args:
+        fields: Number of properties per format
+
+    Returns:
+        Dictionary mapping the schema name to its definition
+    """
+    properties = {}
+    for prefix, (openapi_format, _) in FORMATS.items():
+        for j in range(fields):
+            properties[f"{prefix}_{j}"] = {"type": "string"}
+            if openapi_format:
+                properties[f"{prefix}_{j}"]["format"] = openapi_format
+    return {"FileSchema": {"type": "object", "properties": properties}}
+
+
+def make_payloads(objects, fields):
+    """
+    Build payloads for the file schema.
+
+    Args:
+        objects: Number of payloads
+        fields: Number of properties per format
+
+    Returns:
+        List of dictionaries
+    """
+    return [
+        {
+            f"{prefix}_{j}": value(i + j)
+            for prefix, (_, value) in FORMATS.items()
+            for j in range(fields)
+        }
+        for i in range(objects)
+    ]
+
+
+def validate_all(model, payloads):
+    """
+    Validate every payload with a model.
+
+    Args:
+        model: Generated model class
+        payloads: List of dictionaries
+    """
+    for payload in payloads:
+        model.model_validate(payload)
+
+
+def load_model(schemas, type_mapping, output_dir, name):
+    """
+    Generate, write and import the file model.
+
+    Args:
+        schemas: Dictionary mapping schema names to schema definitions
+        type_mapping: Registry of Python types
+        output_dir: Directory for the module
+        name: Module name
+
+    Returns:
+        The generated `FileSchema` class
+    """
+    models = generate_spec_models(schemas, type_mapping=type_mapping)
+    create_module_file(name, models, output_dir)
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(output_dir, f"{name}.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    # Pydantic resolves the postponed annotations in the module's namespace
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module.FileSchema
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    parser = make_parser(__doc__, repeat=5)
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--fields", type=int, default=3)
+    args = parser.parse_args()
+
+    schemas = make_schemas(args.fields)
+    payloads = make_payloads(args.objects, args.fields)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        models = {
+            "default": load_model(
+                schemas, TypeMapping(), output_dir, "default"
+            ),
+            "throughput": load_model(
+                schemas, TypeMapping(THROUGHPUT_OVERRIDES), output_dir,
+                "throughput",
+            ),
+        }
+
+    print(f"Payloads: {args.objects} with {len(payloads[0])} fields")
+    for label, model in models.items():
+        elapsed = time_median(
+            functools.partial(validate_all, model, payloads), args.repeat
+        )[0]
+        print(
+            f"{label:<12} {elapsed:8.1f} ms "
+            f"{args.objects / elapsed * 1000:10.0f} objects/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,20 +7,54 @@ for each Iconik API specification based on the OpenAPI v3 specification
 `component.schemas` objects.
 """
 import argparse
+import functools
 import glob
+import gzip
+import hashlib
+import io
+import itertools
 import json
 import logging
+import marshal
 import os
 import platform
 import shutil
 import subprocess
 import sys
+import time
+import tracemalloc
+import zlib
 from collections import OrderedDict
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import dataclass, field as dataclass_field
+from datetime import datetime, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
 
-import requests
-from jinja2 import Environment, FileSystemLoader
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+if TYPE_CHECKING:
+    import jinja2
+    import requests
 
 
 __version__ = "2025.5-beta.3"
@@ -53,20 +87,80 @@ SPEC_NAMES = [
 # Base URL for Iconik API specifications
 BASE_URL = "https://app.iconik.io/docs/{}/spec/"
 
+# Number of concurrent specification downloads
+DOWNLOAD_WORKERS = 4
+
 # Output directory for the models package
 OUTPUT_DIR = "models"
 
+# Module holding the models that several specifications define identically
+COMMON_MODULE = "_common"
+
+# Name of the package's __init__ module in the manifest
+INIT_MODULE = "__init__"
+
+# Checkpoint manifest written into the output directory
+MANIFEST_NAME = "_manifest.json"
+
+# Directory in the output directory where generated files are formatted
+STAGING_DIR = "_staging"
+
+# Field names that need a trailing underscore in generated models
+PYTHON_KEYWORDS = frozenset([
+    "class",
+    "from",
+    "import",
+    "return",
+    "pass",
+    "if",
+    "else",
+    "for",
+    "while",
+    "as",
+    "def",
+    "try",
+    "except",
+    "finally",
+    "raise",
+    "with",
+    "yield",
+    "async",
+    "await",
+    "lambda",
+    "None",
+    "True",
+    "False",
+    "and",
+    "or",
+    "not",
+    "in",
+    "is",
+    "global",
+    "nonlocal",
+    "assert",
+    "del",
+    "elif",
+    "continue",
+    "break",
+])
+
+# Highest tracemalloc peak seen before a per-parse measurement reset it
+TRACED_PEAK = {"bytes": 0}
+
+# Name of the model template in the Jinja environment
+MODEL_TEMPLATE_NAME = "models.py.j2"
+
 # Template for Pydantic model generation
 MODEL_TEMPLATE = '''
 {% for model in models %}
-{% if model.get('is_type_alias', False) %}
+{% if model.type_alias is not none %}
 # {{ model.description }}
-{{ model.name }} = {{ model.type_hint }}
+{{ model.name }} = {{ model.type_alias.render() }}
 {% else %}
-class {{ model.name }}({{ model.base_class }}):
+class {{ model.name }}(BaseModel):
     """{{ model.description }}"""
-    {% for field_name, field_info in model.fields.items() %}
-    {{ field_name }}: {{ field_info.type_hint }}{% if field_info.default is not none %} = {{ field_info.default }}{% endif %}
+    {% for field in model.fields.values() %}
+    {{ field.name }}: {{ field.render() }}{% if field.default is not none %} = {{ field.default }}{% endif %}
     {% endfor %}
     {% if model.config %}
 
@@ -80,1005 +174,2819 @@ class {{ model.name }}({{ model.base_class }}):
 '''
 
 
-def download_specs(output_dir: str) -> Dict[str, Dict[str, Any]]:
+def create_session(pool_size: int = DOWNLOAD_WORKERS) -> "requests.Session":
     """
-    Download the OpenAPI specifications for Iconik API.
+    Create an HTTP session with a keep-alive connection pool.
+
+    `requests` is imported here rather than at module level so that offline
+    runs never pay for importing it.
 
     Args:
-        output_dir: Directory to save the downloaded specifications
+        pool_size: Maximum number of pooled connections per host
 
     Returns:
-        Dict mapping specification names to their parsed JSON content
+        Configured requests session
     """
-    specs = OrderedDict()
+    import requests  # pylint: disable=import-outside-toplevel
 
-    for spec_name in SPEC_NAMES:
-        url = BASE_URL.format(spec_name)
-        logger.info("Downloading specification: %s", url)
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1, pool_maxsize=pool_size
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
-        try:
-            response = requests.get(url, timeout=60)
-            response.raise_for_status()
 
-            # Parse the JSON content
-            spec_json = json.loads(
-                response.content,
-                object_pairs_hook=lambda pairs: OrderedDict(pairs),  # pylint: disable=unnecessary-lambda
-            )
-            specs[spec_name] = spec_json
+def write_spec_file(
+    spec_dir: str,
+    spec_name: str,
+    content: bytes,
+    compress: bool = True
+) -> str:
+    """
+    Save a raw specification body as `<spec_name>.json.gz` or `.json`.
 
-            # Save the specification to a file
-            spec_path = os.path.join(output_dir, f"{spec_name}.json")
-            with open(spec_path, "w", encoding="utf-8") as fp:
-                json.dump(spec_json, fp, separators=(",", ":"), sort_keys=True)
+    The other variant is removed so a stale file can never shadow the new one.
 
-            logger.info("Saved specification to: %s", spec_path)
+    Args:
+        spec_dir: Directory to save the specification in
+        spec_name: Name of the specification
+        content: Raw JSON body
+        compress: Whether to gzip-compress the file
 
-        except requests.RequestException as e:
-            logger.error(
-                "Failed to download specification %s: %s", spec_name, e
-            )
+    Returns:
+        Path of the written file
+    """
+    plain_path = os.path.join(spec_dir, f"{spec_name}.json")
+    gzip_path = f"{plain_path}.gz"
+    spec_path, stale_path = ((gzip_path, plain_path) if compress else
+                             (plain_path, gzip_path))
 
-    return specs
+    if compress:
+        content = gzip.compress(content, compresslevel=9, mtime=0)
+    with open(spec_path, "wb") as fp:
+        fp.write(content)
 
+    if os.path.exists(stale_path):
+        os.remove(stale_path)
 
-def extract_schemas(
-    specs: Dict[str, Dict[str, Any]],
-) -> Dict[str, Dict[str, Any]]:
+    return spec_path
+
+
+def read_spec_file(spec_dir: str, spec_name: str) -> bytes:
     """
-    Extract component schemas from the API specifications.
+    Read a raw specification body saved as `.json.gz` or `.json`.
 
     Args:
-        specs: Dictionary mapping specification names to their parsed JSON
-            content
+        spec_dir: Directory containing the specification
+        spec_name: Name of the specification
 
     Returns:
-        Dictionary mapping specification names to their component schemas
+        Raw JSON body
+
+    Raises:
+        FileNotFoundError: If neither variant exists
     """
-    schemas = {}
+    spec_path = os.path.join(spec_dir, f"{spec_name}.json")
 
-    for spec_name, spec in specs.items():
-        if "components" in spec and "schemas" in spec["components"]:
-            schemas[spec_name] = spec["components"]["schemas"]
-        else:
-            logger.warning(
-                "No component schemas found in specification: %s", spec_name
-            )
-            schemas[spec_name] = {}
+    try:
+        with gzip.open(f"{spec_path}.gz", "rb") as fp:
+            return fp.read()
+    except FileNotFoundError:
+        pass
 
-    return schemas
+    with open(spec_path, "rb") as fp:
+        return fp.read()
 
 
-def extract_all_schemas(
-    specs: Dict[str, Dict[str, Any]],
-) -> Dict[str, Dict[str, Any]]:
+def decode_body(content: bytes, content_encoding: str) -> bytes:
     """
-    Extract all component schemas from the API specifications.
+    Decode a response body received with a `Content-Encoding`.
 
     Args:
-        specs: Dictionary mapping specification names to their parsed JSON
-            content
+        content: Body as received on the wire
+        content_encoding: Value of the `Content-Encoding` header
 
     Returns:
-        Dictionary mapping schema names to schema definitions
+        Decoded body
+
+    Raises:
+        ValueError: If the encoding is not supported or the body is corrupt
     """
-    all_schemas = {}
+    encoding = content_encoding.strip().lower()
 
-    for _, spec in specs.items():
-        if "components" in spec and "schemas" in spec["components"]:
-            for schema_name, schema in spec["components"]["schemas"].items():
-                all_schemas[schema_name] = schema
+    try:
+        if encoding in ("", "identity"):
+            return content
+        if encoding in ("gzip", "x-gzip"):
+            return gzip.decompress(content)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(content)
+            except zlib.error:
+                # Some servers send raw deflate data without a zlib header
+                return zlib.decompress(content, -zlib.MAX_WBITS)
+    except (OSError, EOFError, zlib.error) as e:
+        raise ValueError(f"Corrupt {encoding} response body: {e}") from e
 
-    return all_schemas
+    raise ValueError(f"Unsupported content encoding: {content_encoding}")
 
 
-def resolve_schema_references(
-    schema: Dict[str, Any], all_schemas: Dict[str, Dict[str, Any]]
-) -> Dict[str, Any]:
+def read_cached_spec(cache_dir: str,
+                     spec_name: str) -> Tuple[Optional[bytes], Dict[str, str]]:
     """
-    Resolve $ref references in the schema.
+    Read a cached specification body and its validators.
 
     Args:
-        schema: The schema to resolve references in
-        all_schemas: Dictionary of all schemas, keyed by name
+        cache_dir: Directory holding the specification cache
+        spec_name: Name of the specification
 
     Returns:
-        Schema with references resolved
+        Tuple of (body, validators) where body is None if nothing is cached
+            and validators holds the stored `etag` and `last_modified` values
     """
-    if not isinstance(schema, dict):
-        return schema
+    meta_path = os.path.join(cache_dir, f"{spec_name}.meta.json")
 
-    # Create a new schema to avoid modifying the input
-    resolved = {}
-
-    for key, value in schema.items():
-        if key == "$ref" and isinstance(value, str):
-            # Extract reference path components
-            ref_parts = value.split("/")
-            if (
-                ref_parts[0] == "#" and ref_parts[1] == "components"
-                and ref_parts[2] == "schemas"
-            ):
-                ref_name = ref_parts[3]
-                if ref_name in all_schemas:
-                    # Merge the referenced schema
-                    referenced_schema = all_schemas[ref_name]
-                    resolved.update(
-                        resolve_schema_references(
-                            referenced_schema, all_schemas
-                        )
-                    )
-                else:
-                    logger.warning("Referenced schema not found: %s", ref_name)
-                    resolved[key] = value
-            else:
-                resolved[key] = value
-        elif isinstance(value, dict):
-            resolved[key] = resolve_schema_references(value, all_schemas)
-        elif isinstance(value, list):
-            resolved[key] = [(
-                resolve_schema_references(item, all_schemas)
-                if isinstance(item, dict) else item
-            ) for item in value]
-        else:
-            resolved[key] = value
+    try:
+        body = read_spec_file(cache_dir, spec_name)
+        with open(meta_path, "r", encoding="utf-8") as fp:
+            validators = json.load(fp)
+    except (OSError, ValueError):
+        return None, {}
 
-    return resolved
+    return body, validators
 
 
-def openapi_type_to_python(
-    openapi_type: str,
-    openapi_format: Optional[str] = None,
-    is_array: bool = False,
-    ref: Optional[str] = None,
-    enum: Optional[List[Any]] = None,
-) -> str:
+def write_cached_spec(
+    cache_dir: str, spec_name: str, body: bytes, validators: Dict[str, str]
+) -> None:
     """
-    Convert OpenAPI type to Python type hint.
+    Store a specification body and its validators in the cache.
 
     Args:
-        openapi_type: The OpenAPI type
-        openapi_format: The OpenAPI format
-        is_array: Whether the type is an array
-        ref: Reference to another schema
-        enum: Enumeration values
-
-    Returns:
-        Python type hint as a string
+        cache_dir: Directory holding the specification cache
+        spec_name: Name of the specification
+        body: Raw response body
+        validators: The `etag` and `last_modified` values of the response
     """
-    if ref:
-        # Extract the model name from the reference
-        model_name = ref.split("/")[-1]
-        type_hint = model_name
-    elif enum:
-        # For enum types, use Literal
-        enum_values = ", ".join([repr(v) for v in enum])
-        type_hint = f"Literal[{enum_values}]"
-    elif openapi_type == "string":
-        if openapi_format == "date-time":
-            type_hint = "datetime"
-        elif openapi_format == "date":
-            type_hint = "date"
-        elif openapi_format == "uuid":
-            type_hint = "UUID"
-        elif openapi_format in ("uri", "url"):
-            type_hint = "HttpUrl"
-        else:
-            type_hint = "str"
-    elif openapi_type == "integer":
-        if openapi_format == "int64":
-            type_hint = "int"  # Using int for both int32 and int64
-        else:
-            type_hint = "int"
-    elif openapi_type == "number":
-        if openapi_format == "float":
-            type_hint = "float"
-        else:
-            type_hint = "float"
-    elif openapi_type == "boolean":
-        type_hint = "bool"
-    elif openapi_type == "object":
-        type_hint = "Dict[str, Any]"
-    elif openapi_type == "array":
-        # Arrays are handled separately
-        type_hint = "Any"
-    else:
-        type_hint = "Any"
+    os.makedirs(cache_dir, exist_ok=True)
 
-    if is_array:
-        type_hint = f"List[{type_hint}]"
+    write_spec_file(cache_dir, spec_name, body)
 
-    return type_hint
+    meta_path = os.path.join(cache_dir, f"{spec_name}.meta.json")
+    with open(meta_path, "w", encoding="utf-8") as fp:
+        json.dump(validators, fp)
 
 
-# pylint: disable=unused-argument
-def handle_oneof_anyof(
-    schema: Dict[str, Any],
-    all_schemas: Dict[str, Dict[str, Any]],
-    model_names: Set[str] = None,
+def get_parsed_spec_path(
+    parsed_cache_dir: str, spec_name: str, digest: str
 ) -> str:
     """
-    Handle oneOf and anyOf in OpenAPI schemas.
+    Get the path of a parsed specification in the parsed-spec cache.
+
+    Entries are keyed by the SHA-256 of the raw body and the interpreter's
+    cache tag, because the marshal format is only stable within one Python
+    version.
 
     Args:
-        schema: The schema containing oneOf or anyOf
-        all_schemas: Dictionary of all schemas
-        model_names: Set of model names to check for forward references
+        parsed_cache_dir: Directory of the parsed-spec cache
+        spec_name: Name of the specification
+        digest: SHA-256 hex digest of the raw JSON body
 
     Returns:
-        Python type hint as a string
+        Path of the cache entry
     """
-    if model_names is None:
-        model_names = set()
+    return os.path.join(
+        parsed_cache_dir,
+        f"{spec_name}.{digest}.{sys.implementation.cache_tag}.marshal",
+    )
 
-    if "oneOf" in schema:
-        types = []
-        for sub_schema in schema["oneOf"]:
-            if "$ref" in sub_schema:
-                ref = sub_schema["$ref"]
-                model_name = ref.split("/")[-1]
-                # Use string literal for forward references
-                if model_name in model_names:
-                    types.append(f"'{model_name}'")
-                else:
-                    types.append(model_name)
-            else:
-                type_hint = openapi_type_to_python(
-                    sub_schema.get("type", "any"),
-                    sub_schema.get("format"),
-                    is_array=False,
-                    enum=sub_schema.get("enum"),
-                )
-                types.append(type_hint)
-
-        return f"Union[{', '.join(types)}]"
-
-    if "anyOf" in schema:
-        types = []
-        for sub_schema in schema["anyOf"]:
-            if "$ref" in sub_schema:
-                ref = sub_schema["$ref"]
-                model_name = ref.split("/")[-1]
-                # Use string literal for forward references
-                if model_name in model_names:
-                    types.append(f"'{model_name}'")
-                else:
-                    types.append(model_name)
-            else:
-                type_hint = openapi_type_to_python(
-                    sub_schema.get("type", "any"),
-                    sub_schema.get("format"),
-                    is_array=False,
-                    enum=sub_schema.get("enum"),
-                )
-                types.append(type_hint)
 
-        return f"Union[{', '.join(types)}]"
+def share_strings(obj: Any, memo: Dict[str, str]) -> Any:
+    """
+    Copy a parsed JSON structure so equal strings are the same object.
+
+    marshal writes repeated objects as back-references, so sharing the many
+    repeated keys and values of a specification shrinks the cache entry and
+    lets `marshal.loads` skip most string allocations.
 
-    return "Any"
+    Args:
+        obj: Parsed JSON content
+        memo: Strings seen so far, mapped to their shared instance
+
+    Returns:
+        Equal structure with shared strings
+    """
+    if isinstance(obj, dict):
+        return {
+            memo.setdefault(key, key): share_strings(value, memo)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, list):
+        return [share_strings(value, memo) for value in obj]
+    if isinstance(obj, str):
+        return memo.setdefault(obj, obj)
+    return obj
 
 
-def generate_models(
-    schemas: Dict[str, Dict[str, Any]], all_schemas: Dict[str, Dict[str, Any]]
-) -> Dict[str, List[Dict[str, Any]]]:
+def read_parsed_spec(parsed_cache_dir: str, spec_name: str,
+                     digest: str) -> Optional[Dict[str, Any]]:
     """
-    Generate Pydantic models from OpenAPI schemas.
+    Read a parsed specification from the parsed-spec cache.
 
     Args:
-        schemas: Dictionary mapping specification names to their component
-            schemas
-        all_schemas: Dictionary of all schemas
+        parsed_cache_dir: Directory of the parsed-spec cache
+        spec_name: Name of the specification
+        digest: SHA-256 hex digest of the raw JSON body
 
     Returns:
-        Dictionary mapping specification names to lists of model definitions
+        Parsed JSON content, or None if there is no usable entry
     """
-    models_by_spec = {}
+    path = get_parsed_spec_path(parsed_cache_dir, spec_name, digest)
+    try:
+        with open(path, "rb") as fp:
+            return marshal.loads(fp.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        logger.warning("Ignoring unreadable parsed cache entry %s: %s", path, e)
+        return None
 
-    for spec_name, spec_schemas in schemas.items():
-        models = []
-
-        # First, collect all model names that will be defined
-        model_names = set(spec_schemas.keys())
-
-        for model_name, schema in spec_schemas.items():
-            # Handle oneOf/anyOf at the top level
-            if "oneOf" in schema or "anyOf" in schema:
-                # Pass model_names to handle_oneof_anyof to identify forward
-                # references
-                type_hint = handle_oneof_anyof(schema, all_schemas, model_names)
-
-                model = {
-                    "name": model_name,
-                    "is_type_alias": True,
-                    "type_hint": type_hint,
-                    "description": schema.get(
-                        "description", f"Type alias for {model_name}."
-                    ),
-                }
 
-                models.append(model)
-                continue
+def write_parsed_spec(
+    parsed_cache_dir: str,
+    spec_name: str,
+    digest: str,
+    spec_json: Dict[str, Any],
+) -> None:
+    """
+    Write a parsed specification to the parsed-spec cache.
 
-            # Skip non-object schemas
-            if schema.get("type") != "object" and "properties" not in schema:
-                logger.warning("Skipping non-object schema: %s", model_name)
-                continue
+    The entry is written atomically, and older entries of the same
+    specification are removed so the cache holds one entry per specification
+    and Python version.
 
-            # Get required fields
-            required = schema.get("required", [])
+    Args:
+        parsed_cache_dir: Directory of the parsed-spec cache
+        spec_name: Name of the specification
+        digest: SHA-256 hex digest of the raw JSON body
+        spec_json: Parsed JSON content
+    """
+    path = get_parsed_spec_path(parsed_cache_dir, spec_name, digest)
+    pattern = get_parsed_spec_path(
+        glob.escape(parsed_cache_dir), spec_name, "*"
+    )
+    try:
+        os.makedirs(parsed_cache_dir, exist_ok=True)
+        for stale_path in glob.glob(pattern):
+            if stale_path != path:
+                os.remove(stale_path)
+
+        with open(f"{path}.tmp", "wb") as fp:
+            marshal.dump(share_strings(spec_json, {}), fp)
+        os.replace(f"{path}.tmp", path)
+    except OSError as e:
+        logger.warning("Failed to write parsed cache entry %s: %s", path, e)
 
-            # Process properties
-            properties = schema.get("properties", {})
-            fields = {}
 
-            for field_name, field_schema in properties.items():
-                field_name, field_info = generate_model_field(
-                    field_name, field_schema, required, model_names
-                )
-                fields[field_name] = field_info
+def parse_spec(
+    spec_name: str,
+    content: bytes,
+    trace_memory: bool = False,
+    parsed_cache_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Parse a raw specification body into plain dicts.
 
-            # Add model configuration
-            config = {}
+    With a `parsed_cache_dir`, warm runs load the parsed structure from the
+    parsed-spec cache instead of parsing the JSON again, and cold runs fill
+    the cache. The parse time is always logged. When `trace_memory` is set,
+    the peak allocation of the parse is measured with tracemalloc and logged
+    as well.
 
-            # Handle extra fields
-            if "additionalProperties" in schema:
-                config["extra"] = "allow"
+    Args:
+        spec_name: Name of the specification
+        content: Raw JSON body
+        trace_memory: Whether to measure the peak allocation of the parse
+        parsed_cache_dir: Directory of the parsed-spec cache, if any
 
-            # Create model definition
-            model = {
-                "name": model_name,
-                "base_class": "BaseModel",
-                "description": schema.get(
-                    "description",
-                    f"Represents a {model_name} in the Iconik system.",
-                ),
-                "fields": fields,
-                "config": config,
-            }
+    Returns:
+        Parsed JSON content
+    """
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        get_traced_peak()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    spec_json = None
+    if parsed_cache_dir:
+        digest = hashlib.sha256(content).hexdigest()
+        spec_json = read_parsed_spec(parsed_cache_dir, spec_name, digest)
+
+    source = "cache"
+    if spec_json is None:
+        source = "JSON"
+        spec_json = json_loads(content)
+    elapsed = time.perf_counter() - start
+
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        logger.info(
+            "Parsed specification %s (%d bytes) from %s in %.1f ms, "
+            "peak %.1f KiB",
+            spec_name,
+            len(content),
+            source,
+            elapsed * 1000,
+            peak / 1024,
+        )
+    else:
+        logger.info(
+            "Parsed specification %s (%d bytes) from %s in %.1f ms",
+            spec_name,
+            len(content),
+            source,
+            elapsed * 1000,
+        )
 
-            models.append(model)
+    if parsed_cache_dir and source == "JSON":
+        write_parsed_spec(parsed_cache_dir, spec_name, digest, spec_json)
 
-        # Sort models by dependency
-        sorted_models = sort_models_by_dependency(models)
+    return spec_json
 
-        models_by_spec[spec_name] = sorted_models
 
-    return models_by_spec
+def get_traced_peak() -> int:
+    """
+    Return the highest traced memory peak of the run so far.
 
+    `parse_spec` resets the tracemalloc peak to measure individual parses,
+    so the overall peak is folded into `TRACED_PEAK` before every reset.
 
-def generate_model_field(
-    field_name: str,
-    schema: Dict[str, Any],
-    required: List[str],
-    model_names: Set[str] = None,
-) -> Tuple[str, Dict[str, Any]]:
+    Returns:
+        Peak traced memory in bytes, or 0 if tracemalloc is not tracing
     """
-    Generate a Pydantic field definition from an OpenAPI schema property.
+    if tracemalloc.is_tracing():
+        TRACED_PEAK["bytes"] = max(
+            TRACED_PEAK["bytes"],
+            tracemalloc.get_traced_memory()[1]
+        )
+    return TRACED_PEAK["bytes"]
+
+
+def download_spec(
+    session: "requests.Session",
+    spec_name: str,
+    output_dir: str,
+    base_url: str = BASE_URL,
+    *,
+    cache_dir: Optional[str] = None,
+    compress: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """
+    Download a single OpenAPI specification for Iconik API.
+
+    gzip and deflate transfer encodings are negotiated explicitly, and the
+    body is read undecoded so the bytes on the wire can be measured. When a
+    cache directory is given, the request is made conditional on the cached
+    ETag and Last-Modified values and the cached body is reused when the
+    server answers 304 Not Modified.
 
     Args:
-        field_name: Name of the field
-        schema: OpenAPI schema for the field
-        required: List of required field names
-        model_names: Set of model names to check for forward references
+        session: HTTP session used for the request
+        spec_name: Name of the specification to download
+        output_dir: Directory to save the downloaded specification
+        base_url: URL template for the specification endpoints
+        cache_dir: Directory holding the conditional-GET cache, if any
+        compress: Whether to save the specification gzip-compressed
 
     Returns:
-        Tuple of (field_name, field_info) where field_info contains type_hint
-            and default
+        Dict with the raw JSON body under `content`, the cache status (`hit`,
+            `miss` or None when uncached) under `cache`, and the sizes on the
+            wire and on disk under `wire_bytes` and `disk_bytes`, or None if
+            the download failed
     """
-    if model_names is None:
-        model_names = set()
+    import requests  # pylint: disable=import-outside-toplevel
 
-    # Store the original field name for potential use as an alias
-    original_field_name = field_name
+    url = base_url.format(spec_name)
+    logger.info("Downloading specification: %s", url)
 
-    # Check if field name contains dashes or other invalid characters
-    has_invalid_chars = "-" in field_name or field_name.startswith("x-")
+    cached_body, validators = (
+        read_cached_spec(cache_dir, spec_name) if cache_dir else (None, {})
+    )
 
-    # Convert dashed names to underscore
-    if has_invalid_chars:
-        # For fields starting with x-, keep the x_ prefix
-        if field_name.startswith("x-"):
-            field_name = "x_" + field_name[2:].replace("-", "_")
-        else:
-            field_name = field_name.replace("-", "_")
+    headers = {}
+    if cached_body is not None:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
 
-    # Convert Python keywords
-    if field_name in [
-        "class",
-        "from",
-        "import",
-        "return",
-        "pass",
-        "if",
-        "else",
-        "for",
-        "while",
-        "as",
-        "def",
-        "try",
-        "except",
-        "finally",
-        "raise",
-        "with",
-        "yield",
-        "async",
-        "await",
-        "lambda",
-        "None",
-        "True",
-        "False",
-        "and",
-        "or",
-        "not",
-        "in",
-        "is",
-        "global",
-        "nonlocal",
-        "assert",
-        "del",
-        "elif",
-        "continue",
-        "break",
-    ]:
-        field_name = f"{field_name}_"
+    start = time.perf_counter()
+    try:
+        response = session.get(url, headers=headers, timeout=60, stream=True)
+        try:
+            response.raise_for_status()
+            wire_content = response.raw.read(decode_content=False)
+            response_content = decode_body(
+                wire_content, response.headers.get("Content-Encoding", "")
+            )
+        except BaseException:
+            response.close()
+            raise
+        response.raw.release_conn()
+    except (requests.RequestException, ValueError) as e:
+        logger.error("Failed to download specification %s: %s", spec_name, e)
+        return None
 
-    # Handle references
-    if "$ref" in schema:
-        ref = schema["$ref"]
-        ref_name = ref.split("/")[-1]
+    logger.info(
+        "Downloaded specification %s in %.3f s (%d bytes on the wire, %s)",
+        spec_name,
+        time.perf_counter() - start,
+        len(wire_content),
+        response.headers.get("Content-Encoding") or "uncompressed",
+    )
 
-        # Use string literals for forward references
-        if ref_name in model_names:
-            type_hint = f"'{ref_name}'"
+    cache_status = None
+    if cache_dir:
+        if response.status_code == 304 and cached_body is not None:
+            cache_status = "hit"
+            content = cached_body
         else:
-            type_hint = ref_name
+            cache_status = "miss"
+            content = response_content
+            write_cached_spec(
+                cache_dir,
+                spec_name,
+                content,
+                {
+                    "etag": response.headers.get("ETag", ""),
+                    "last_modified": response.headers.get("Last-Modified", ""),
+                },
+            )
+        logger.info("Specification cache %s: %s", cache_status, spec_name)
+    else:
+        content = response_content
 
-        is_required = original_field_name in required
+    # Save the response body exactly as received, optionally compressed
+    spec_path = write_spec_file(output_dir, spec_name, content, compress)
 
-        field_info = {
-            "type_hint": (
-                f"Optional[{type_hint}]" if not is_required else type_hint
-            ),
-            "default": "None" if not is_required else None,
-        }
+    logger.info("Saved specification to: %s", spec_path)
 
-        # Add alias if the field name has been changed
-        if has_invalid_chars:
-            if field_info["default"] is None:
-                field_info["default"] = (
-                    f'Field(..., alias="{original_field_name}")'
-                )
-            else:
-                field_info["default"] = (
-                    f'Field(None, alias="{original_field_name}")'
-                )
+    return {
+        "content": content,
+        "cache": cache_status,
+        "wire_bytes": len(wire_content),
+        "disk_bytes": os.path.getsize(spec_path),
+    }
 
-        return field_name, field_info
 
-    # Handle oneOf/anyOf
-    if "oneOf" in schema or "anyOf" in schema:
-        # Pass model_names to handle_oneof_anyof
-        type_hint = handle_oneof_anyof(schema, {}, model_names)
-        is_required = original_field_name in required
+def order_specs(specs: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Order specifications like `SPEC_NAMES`.
 
-        field_info = {
-            "type_hint": (
-                f"Optional[{type_hint}]" if not is_required else type_hint
-            ),
-            "default": "None" if not is_required else None,
-        }
+    Specifications missing from `SPEC_NAMES` follow the known ones in their
+    original order.
 
-        # Add alias if the field name has been changed
-        if has_invalid_chars:
-            if field_info["default"] is None:
-                field_info["default"] = (
-                    f'Field(..., alias="{original_field_name}")'
-                )
-            else:
-                field_info["default"] = (
-                    f'Field(None, alias="{original_field_name}")'
-                )
+    Args:
+        specs: Dictionary mapping specification names to their parsed JSON
+            content, in any order
 
-        return field_name, field_info
+    Returns:
+        Dict mapping specification names to their parsed JSON content
+    """
+    return OrderedDict((spec_name, specs[spec_name])
+                       for spec_name in sorted(specs, key=spec_rank))
+
+
+def iter_downloaded_specs(
+    output_dir: str,
+    workers: int = DOWNLOAD_WORKERS,
+    base_url: str = BASE_URL,
+    *,
+    cache_dir: Optional[str] = None,
+    trace_memory: bool = False,
+    spec_names: Optional[List[str]] = None,
+    compress: bool = True,
+    parsed_cache_dir: Optional[str] = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Download the OpenAPI specifications and yield them as they arrive.
 
-    # Handle arrays
-    if schema.get("type") == "array":
-        items = schema.get("items", {})
-        if "$ref" in items:
-            ref = items["$ref"]
-            ref_name = ref.split("/")[-1]
+    Downloads run concurrently on a thread pool that shares one keep-alive
+    connection pool. Each body is parsed once, on the consuming thread, and
+    yielded in completion order so callers can start working on it while the
+    remaining downloads are still in flight.
 
-            # Use string literals for forward references
-            if ref_name in model_names:
-                item_type = f"'{ref_name}'"
-            else:
-                item_type = ref_name
-        else:
-            item_type = openapi_type_to_python(
-                items.get("type", "any"),
-                items.get("format"),
-                enum=items.get("enum"),
-            )
+    Args:
+        output_dir: Directory to save the downloaded specifications
+        workers: Number of concurrent downloads
+        base_url: URL template for the specification endpoints
+        cache_dir: Directory holding the conditional-GET cache, if any
+        trace_memory: Whether to measure the peak allocation of each parse
+        spec_names: Specifications to download (default: `SPEC_NAMES`)
+        compress: Whether to save the specifications gzip-compressed
+        parsed_cache_dir: Directory of the parsed-spec cache, if any
+
+    Yields:
+        Tuples of (spec_name, parsed JSON content)
+    """
+    if spec_names is None:
+        spec_names = SPEC_NAMES
+
+    workers = max(1, workers)
+    downloaded = 0
+    spec_bytes = 0
+    wire_bytes = 0
+    disk_bytes = 0
+    cache_hits = []
+    cache_misses = []
+
+    start = time.perf_counter()
+    with create_session(workers) as session, ThreadPoolExecutor(
+        max_workers=workers
+    ) as executor:
+        futures = {
+            executor.submit(
+                download_spec,
+                session,
+                spec_name,
+                output_dir,
+                base_url,
+                cache_dir=cache_dir,
+                compress=compress,
+            ): spec_name
+            for spec_name in spec_names
+        }
 
-        type_hint = f"List[{item_type}]"
-        is_required = original_field_name in required
+        for future in as_completed(futures):
+            # Drop each future once consumed so its body can be freed
+            spec_name = futures.pop(future)
+            result = future.result()
+            if result is None:
+                continue
 
-        default = "Field(default_factory=list)"
-        if has_invalid_chars:
-            default = f'Field(default_factory=list, alias="{original_field_name}")'  # pylint: disable=line-too-long
+            spec_bytes += len(result["content"])
+            wire_bytes += result["wire_bytes"]
+            disk_bytes += result["disk_bytes"]
 
-        if is_required:
-            if has_invalid_chars:
-                default = f'Field(..., alias="{original_field_name}")'
-            else:
-                default = None
-
-        return field_name, {
-            "type_hint": (
-                f"Optional[{type_hint}]" if not is_required else type_hint
-            ),
-            "default": default,
-        }
-
-    # Handle objects
-    if schema.get("type") == "object":
-        if "additionalProperties" in schema:
-            if "$ref" in schema["additionalProperties"]:
-                ref = schema["additionalProperties"]["$ref"]
-                ref_name = ref.split("/")[-1]
-
-                # Use string literals for forward references
-                if ref_name in model_names:
-                    value_type = f"'{ref_name}'"
-                else:
-                    value_type = ref_name
-            else:
-                value_type = openapi_type_to_python(
-                    schema["additionalProperties"].get("type", "any"),
-                    schema["additionalProperties"].get("format"),
+            try:
+                spec_json = parse_spec(
+                    spec_name,
+                    result.pop("content"),
+                    trace_memory,
+                    parsed_cache_dir,
+                )
+            except ValueError as e:
+                logger.error(
+                    "Failed to parse specification %s: %s", spec_name, e
                 )
+                continue
 
-            type_hint = f"Dict[str, {value_type}]"
-        else:
-            type_hint = "Dict[str, Any]"
+            downloaded += 1
+            if result["cache"] == "hit":
+                cache_hits.append(spec_name)
+            elif result["cache"] == "miss":
+                cache_misses.append(spec_name)
+
+            yield spec_name, spec_json
+            del spec_json
+
+    logger.info(
+        "Downloaded %d of %d specifications in %.3f s using %d worker(s)",
+        downloaded,
+        len(spec_names),
+        time.perf_counter() - start,
+        workers,
+    )
+    logger.info(
+        "Specification bytes: %d on the wire, %d on disk, %d uncompressed",
+        wire_bytes,
+        disk_bytes,
+        spec_bytes,
+    )
 
-        is_required = original_field_name in required
+    if cache_dir:
+        logger.info(
+            "Specification cache: %d hit(s) [%s], %d miss(es) [%s]",
+            len(cache_hits),
+            ", ".join(sorted(cache_hits, key=SPEC_NAMES.index)),
+            len(cache_misses),
+            ", ".join(sorted(cache_misses, key=SPEC_NAMES.index)),
+        )
 
-        default = "Field(default_factory=dict)"
-        if has_invalid_chars:
-            default = f'Field(default_factory=dict, alias="{original_field_name}")'  # pylint: disable=line-too-long
 
-        if is_required:
-            if has_invalid_chars:
-                default = f'Field(..., alias="{original_field_name}")'
-            else:
-                default = None
+def download_specs(
+    output_dir: str,
+    workers: int = DOWNLOAD_WORKERS,
+    base_url: str = BASE_URL,
+    *,
+    cache_dir: Optional[str] = None,
+    trace_memory: bool = False,
+    compress: bool = True,
+    parsed_cache_dir: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Download the OpenAPI specifications for Iconik API.
 
-        return field_name, {
-            "type_hint": (
-                f"Optional[{type_hint}]" if not is_required else type_hint
-            ),
-            "default": default,
-        }
+    Downloads run concurrently (see `iter_downloaded_specs`), but the result
+    is always ordered like `SPEC_NAMES`.
 
-    # Handle other types
-    type_hint = openapi_type_to_python(
-        schema.get("type", "any"),
-        schema.get("format"),
-        enum=schema.get("enum")
+    Args:
+        output_dir: Directory to save the downloaded specifications
+        workers: Number of concurrent downloads
+        base_url: URL template for the specification endpoints
+        cache_dir: Directory holding the conditional-GET cache, if any
+        trace_memory: Whether to measure the peak allocation of each parse
+        compress: Whether to save the specifications gzip-compressed
+        parsed_cache_dir: Directory of the parsed-spec cache, if any
+
+    Returns:
+        Dict mapping specification names to their parsed JSON content
+    """
+    return order_specs(
+        dict(
+            iter_downloaded_specs(
+                output_dir,
+                workers,
+                base_url,
+                cache_dir=cache_dir,
+                trace_memory=trace_memory,
+                compress=compress,
+                parsed_cache_dir=parsed_cache_dir,
+            )
+        )
     )
 
-    is_required = original_field_name in required
 
-    # Start building constraints list, beginning with an alias if needed
-    constraints = []
-    if has_invalid_chars:
-        constraints.append(f'alias="{original_field_name}"')
+def iter_loaded_specs(
+    spec_dir: str,
+    trace_memory: bool = False,
+    spec_names: Optional[List[str]] = None,
+    parsed_cache_dir: Optional[str] = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Load the OpenAPI specifications from a local directory one at a time.
 
-    # Handle patterns and constraints
-    if schema.get("pattern"):
-        pattern = schema["pattern"]
-        constraints.append(f'pattern="{pattern}"')
+    Args:
+        spec_dir: Directory containing `<spec_name>.json` or
+            `<spec_name>.json.gz` files
+        trace_memory: Whether to measure the peak allocation of each parse
+        spec_names: Specifications to load (default: `SPEC_NAMES`)
+        parsed_cache_dir: Directory of the parsed-spec cache, if any
+
+    Yields:
+        Tuples of (spec_name, parsed JSON content) in `SPEC_NAMES` order
+    """
+    if spec_names is None:
+        spec_names = SPEC_NAMES
 
-    # Handle min/max
-    if schema.get("minimum") is not None:
-        constraints.append(f"ge={schema['minimum']}")
-    if schema.get("maximum") is not None:
-        constraints.append(f"le={schema['maximum']}")
+    for spec_name in spec_names:
+        spec_path = os.path.join(spec_dir, f"{spec_name}.json")
+        logger.info("Loading specification: %s[.gz]", spec_path)
 
-    # Handle min/max length
-    if schema.get("minLength") is not None:
-        constraints.append(f"min_length={schema['minLength']}")
-    if schema.get("maxLength") is not None:
-        constraints.append(f"max_length={schema['maxLength']}")
+        try:
+            content = read_spec_file(spec_dir, spec_name)
+            spec_json = parse_spec(
+                spec_name, content, trace_memory, parsed_cache_dir
+            )
+        except FileNotFoundError:
+            logger.error("Specification file not found: %s[.gz]", spec_path)
+            continue
+        except (OSError, ValueError) as e:
+            logger.error("Failed to load specification %s: %s", spec_name, e)
+            continue
 
-    # Handle min/max items
-    if schema.get("minItems") is not None:
-        constraints.append(f"min_items={schema['minItems']}")
-    if schema.get("maxItems") is not None:
-        constraints.append(f"max_items={schema['maxItems']}")
+        yield spec_name, spec_json
+        del spec_json
 
-    # Add description if available
-    if schema.get("description"):
-        description = schema["description"].replace('"', '\\"')
-        constraints.append(f'description="{description}"')
 
-    if constraints:
-        constraints_str = ", ".join(constraints)
+def load_specs(
+    spec_dir: str,
+    trace_memory: bool = False,
+    parsed_cache_dir: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the OpenAPI specifications for Iconik API from a local directory.
 
-        if is_required:
-            default = f"Field(..., {constraints_str})"
-        else:
-            default = f"Field(None, {constraints_str})"
-    else:
-        default = "None" if not is_required else None
+    Args:
+        spec_dir: Directory containing `<spec_name>.json` or
+            `<spec_name>.json.gz` files
+        trace_memory: Whether to measure the peak allocation of each parse
+        parsed_cache_dir: Directory of the parsed-spec cache, if any
 
-    return field_name, {
-        "type_hint": f"Optional[{type_hint}]" if not is_required else type_hint,
-        "default": default,
-    }
+    Returns:
+        Dict mapping specification names to their parsed JSON content
+    """
+    return OrderedDict(
+        iter_loaded_specs(
+            spec_dir, trace_memory, parsed_cache_dir=parsed_cache_dir
+        )
+    )
 
 
-def collect_model_dependencies(
-    models: List[Dict[str, Any]],
-) -> Dict[str, Set[str]]:
+def store_spec_blob(store_dir: str, content: bytes) -> str:
     """
-    Collect dependencies between models.
+    Store a raw specification body in the content-addressed snapshot store.
+
+    Blobs are gzip-compressed and keyed by the SHA-256 of the raw body, so
+    identical specifications are only ever stored once.
 
     Args:
-        models: List of model definitions
+        store_dir: Directory of the snapshot store
+        content: Raw JSON body
 
     Returns:
-        Dictionary mapping model names to sets of dependent model names
+        Hex digest identifying the blob
     """
-    dependencies = {}
-
-    for model in models:
-        model_name = model["name"]
-        dependencies[model_name] = set()
+    digest = hashlib.sha256(content).hexdigest()
+    blob_path = os.path.join(
+        store_dir, "objects", digest[:2], f"{digest[2:]}.json.gz"
+    )
 
-        if model.get("is_type_alias", False):
-            type_hint = model["type_hint"]
+    if not os.path.exists(blob_path):
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        temp_path = f"{blob_path}.tmp"
+        with open(temp_path, "wb") as fp:
+            fp.write(gzip.compress(content, compresslevel=9, mtime=0))
+        os.replace(temp_path, blob_path)
 
-            # Extract model names from type hint
-            for other_model in models:
-                other_name = other_model["name"]
-                if other_name != model_name and other_name in type_hint:
-                    dependencies[model_name].add(other_name)
+    return digest
 
-            continue
 
-        for field_info in model["fields"].values():
-            type_hint = field_info["type_hint"]
+def read_spec_blob(store_dir: str, digest: str) -> bytes:
+    """
+    Read a raw specification body from the snapshot store.
 
-            # Extract model names from type hints
-            for other_model in models:
-                other_name = other_model["name"]
-                if other_name != model_name and other_name in type_hint:
-                    dependencies[model_name].add(other_name)
+    Args:
+        store_dir: Directory of the snapshot store
+        digest: Hex digest identifying the blob
 
-    return dependencies
+    Returns:
+        Raw JSON body
+    """
+    blob_path = os.path.join(
+        store_dir, "objects", digest[:2], f"{digest[2:]}.json.gz"
+    )
+    with gzip.open(blob_path, "rb") as fp:
+        return fp.read()
 
 
-def sort_models_by_dependency(
-    models: List[Dict[str, Any]],
-) -> List[Dict[str, Any]]:
+def load_snapshot_index(store_dir: str) -> Dict[str, List[Dict[str, Any]]]:
     """
-    Sort models by dependency order to ensure dependent models come first.
+    Load the index of snapshots in the snapshot store.
 
     Args:
-        models: List of model definitions
+        store_dir: Directory of the snapshot store
 
     Returns:
-        Sorted list of model definitions
+        Index with a `snapshots` list, oldest first
     """
-    # Collect model names
-    model_names = [model["name"] for model in models]
+    try:
+        with open(
+            os.path.join(store_dir, "index.json"), "r", encoding="utf-8"
+        ) as fp:
+            return json.load(fp)
+    except FileNotFoundError:
+        return {"snapshots": []}
 
-    # Collect dependencies
-    dependencies = collect_model_dependencies(models)
 
-    # Helper function to get dependencies for a model
-    def get_deps(name):
-        return dependencies.get(name, set())
+def save_snapshot(store_dir: str, spec_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Record the specifications in a directory as a snapshot.
 
-    # Create a mapping of models by name
-    models_by_name = {model["name"]: model for model in models}
+    A new snapshot is only added to the index when its contents differ from
+    the latest snapshot.
 
-    # Perform topological sort
-    sorted_names = []
-    visited = set()
-    temp_marks = set()
+    Args:
+        store_dir: Directory of the snapshot store
+        spec_dir: Directory containing `<spec_name>.json` or
+            `<spec_name>.json.gz` files
 
-    def visit(name):
-        if name in temp_marks:
-            # Circular dependency detected, just continue
-            return
-        if name not in visited:
-            temp_marks.add(name)
-            for dep in get_deps(name):
-                if dep in model_names:
-                    visit(dep)
-            temp_marks.remove(name)
-            visited.add(name)
-            sorted_names.append(name)
+    Returns:
+        The latest snapshot, or None if there was nothing to record
+    """
+    spec_digests = {}
+    for spec_name in SPEC_NAMES:
+        try:
+            content = read_spec_file(spec_dir, spec_name)
+        except FileNotFoundError:
+            continue
+        spec_digests[spec_name] = store_spec_blob(store_dir, content)
+
+    if not spec_digests:
+        return None
 
-    # Visit all nodes
-    for name in model_names:
-        if name not in visited:
-            visit(name)
+    index = load_snapshot_index(store_dir)
+    if index["snapshots"] and index["snapshots"][-1]["specs"] == spec_digests:
+        logger.info(
+            "Specifications unchanged since snapshot %s",
+            index["snapshots"][-1]["id"],
+        )
+        return index["snapshots"][-1]
 
-    # Reverse the order so that dependencies come first
-    sorted_names.reverse()
+    digest = hashlib.sha256(json.dumps(spec_digests, sort_keys=True).encode())
+    snapshot = {
+        "id": digest.hexdigest()[:12],
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "specs": spec_digests,
+    }
+    index["snapshots"].append(snapshot)
 
-    # Create sorted list of models
-    sorted_models = []
-    for name in sorted_names:
-        if name in models_by_name:
-            sorted_models.append(models_by_name[name])
+    index_path = os.path.join(store_dir, "index.json")
+    with open(f"{index_path}.tmp", "w", encoding="utf-8") as fp:
+        json.dump(index, fp, indent=2)
+    os.replace(f"{index_path}.tmp", index_path)
 
-    return sorted_models
+    logger.info(
+        "Recorded snapshot %s with %d specification(s)",
+        snapshot["id"],
+        len(spec_digests),
+    )
+    return snapshot
 
 
-def generate_model_code(models: List[Dict[str, Any]]) -> str:
+def find_snapshot(store_dir: str, snapshot_id: str) -> Optional[Dict[str, Any]]:
     """
-    Generate Python code for Pydantic models.
+    Find a snapshot by ID, unique ID prefix, or `latest`.
+
+    When the same contents were recorded several times, the most recent
+    snapshot is returned.
 
     Args:
-        models: List of model definitions
+        store_dir: Directory of the snapshot store
+        snapshot_id: Snapshot ID, unique ID prefix, or `latest`
 
     Returns:
-        Python code as a string
+        The matching snapshot, or None if there is no unique match
     """
-    env = Environment(loader=FileSystemLoader("."))
-    template = env.from_string(MODEL_TEMPLATE)
+    snapshots = load_snapshot_index(store_dir)["snapshots"]
+
+    if snapshot_id == "latest":
+        return snapshots[-1] if snapshots else None
 
-    return template.render(models=models)
+    matches = {
+        snapshot["id"]: snapshot
+        for snapshot in snapshots
+        if snapshot["id"].startswith(snapshot_id)
+    }
+    if len(matches) != 1:
+        return None
 
+    return next(iter(matches.values()))
 
-def create_module_file(
-    spec_name: str, models: List[Dict[str, Any]], output_dir: str
-) -> None:
+
+def iter_snapshot_specs(
+    store_dir: str,
+    snapshot: Dict[str, Any],
+    trace_memory: bool = False,
+    spec_names: Optional[List[str]] = None,
+    parsed_cache_dir: Optional[str] = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
     """
-    Create a Python module file for a specification's models.
+    Load the specifications of a snapshot one at a time.
 
     Args:
-        spec_name: Name of the specification
-        models: List of model definitions
-        output_dir: Directory to save the module file
+        store_dir: Directory of the snapshot store
+        snapshot: Snapshot returned by `find_snapshot`
+        trace_memory: Whether to measure the peak allocation of each parse
+        spec_names: Specifications to load (default: `SPEC_NAMES`)
+        parsed_cache_dir: Directory of the parsed-spec cache, if any
+
+    Yields:
+        Tuples of (spec_name, parsed JSON content) in `SPEC_NAMES` order
     """
-    # Convert spec name to Python module name
-    module_name = spec_name.replace("-", "_")
+    if spec_names is None:
+        spec_names = SPEC_NAMES
 
-    # Create module file path
-    module_path = os.path.join(output_dir, f"{module_name}.py")
+    for spec_name in spec_names:
+        digest = snapshot["specs"].get(spec_name)
+        if digest is None:
+            logger.error(
+                "Specification %s is not part of snapshot %s",
+                spec_name,
+                snapshot["id"],
+            )
+            continue
 
-    # Essential imports to avoid circular dependencies
-    imports = {
-        "from __future__ import annotations",
-        "from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING",
-    }
-    imports.add("from pydantic import BaseModel, Field")
+        logger.info(
+            "Loading specification %s from snapshot %s",
+            spec_name,
+            snapshot["id"],
+        )
 
-    # Check for specific types
-    has_datetime = False
-    has_date = False
-    has_uuid = False
-    has_url = False
-    has_literal = False
+        try:
+            content = read_spec_blob(store_dir, digest)
+            spec_json = parse_spec(
+                spec_name, content, trace_memory, parsed_cache_dir
+            )
+        except (OSError, ValueError) as e:
+            logger.error("Failed to load specification %s: %s", spec_name, e)
+            continue
 
-    for model in models:
-        if model.get("is_type_alias", False):
-            type_hint = model["type_hint"]
-
-            if "datetime" in type_hint:
-                has_datetime = True
-            if "date" in type_hint and "datetime" not in type_hint:
-                has_date = True
-            if "UUID" in type_hint:
-                has_uuid = True
-            if "HttpUrl" in type_hint:
-                has_url = True
-            if "Literal" in type_hint:
-                has_literal = True
+        yield spec_name, spec_json
+        del spec_json
 
-            continue
 
-        for field_info in model["fields"].values():
-            type_hint = field_info["type_hint"]
-
-            if "datetime" in type_hint:
-                has_datetime = True
-            if "date" in type_hint and "datetime" not in type_hint:
-                has_date = True
-            if "UUID" in type_hint:
-                has_uuid = True
-            if "HttpUrl" in type_hint:
-                has_url = True
-            if "Literal" in type_hint:
-                has_literal = True
-
-    if has_datetime or has_date:
-        if has_datetime and has_date:
-            imports.add("from datetime import date, datetime")
-        elif has_datetime:
-            imports.add("from datetime import datetime")
-        else:
-            imports.add("from datetime import date")
+def extract_schemas(
+    specs: Dict[str, Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract component schemas from the API specifications.
 
-    if has_uuid:
-        imports.add("from uuid import UUID")
+    Args:
+        specs: Dictionary mapping specification names to their parsed JSON
+            content
 
-    if has_url:
-        imports.add("from pydantic import HttpUrl")
+    Returns:
+        Dictionary mapping specification names to their component schemas
+    """
+    schemas = {}
 
-    if has_literal:
-        imports.add("from typing import Literal")
+    for spec_name, spec in specs.items():
+        if "components" in spec and "schemas" in spec["components"]:
+            schemas[spec_name] = spec["components"]["schemas"]
+        else:
+            logger.warning(
+                "No component schemas found in specification: %s", spec_name
+            )
+            schemas[spec_name] = {}
 
-    # Generate module docstring
-    docstring = (
-        "# pylint: disable=line-too-long\n"
-        f'"""\nIconik {spec_name.capitalize()} Models\n\n'
-        f"This module contains Pydantic models for the Iconik "
-        f'{spec_name.capitalize()} API.\n"""'
-    )
+    return schemas
 
-    # Generate model code with string literals for cross-references
-    model_code = generate_model_code(models)
 
-    # Write the module file
-    with open(module_path, "w", encoding="utf-8") as fp:
-        fp.write(docstring + "\n\n")
-        fp.write("\n".join(sorted(imports)) + "\n\n\n")
-        fp.write(model_code)
+def spec_rank(spec_name: str) -> int:
+    """
+    Get the position of a specification in `SPEC_NAMES`.
 
-        # Add model_rebuild calls to resolve forward references
-        fp.write("\n\n# Update forward references\n")
-        for model in models:
-            if not model.get("is_type_alias", False):
-                fp.write(f"{model['name']}.model_rebuild()\n")
+    Args:
+        spec_name: Name of the specification
 
-    logger.info("Created module file: %s", module_path)
+    Returns:
+        Index in `SPEC_NAMES`, or its length for unknown specifications
+    """
+    if spec_name in SPEC_NAMES:
+        return SPEC_NAMES.index(spec_name)
+    return len(SPEC_NAMES)
 
 
-def get_calendar_version(patch=None, modifier=None, modifier_num=None):
+def schema_digest(schema: Any) -> bytes:
     """
-    Generate a calendar-based version string in the format
-    YYYY.M[.P][-modifier.N]
+    Hash a schema definition independently of its key order.
 
     Args:
-        patch: Optional patch number
-        modifier: Optional pre-release identifier (alpha/beta/rc)
-        modifier_num: Optional pre-release sequence number
+        schema: Schema definition
 
     Returns:
-        str: Calendar-based version string
+        SHA-256 digest of the canonical JSON form
     """
-    now = datetime.now()
-    year = now.year
-    month = now.month
+    return hashlib.sha256(
+        json.dumps(schema, sort_keys=True, separators=(",", ":")).encode()
+    ).digest()
 
-    # Start with YYYY.M
-    version = f"{year}.{month}"
 
-    # Add patch if provided
-    if patch is not None:
-        version += f".{patch}"
+def structural_digest(schema: Any) -> bytes:
+    """
+    Hash the structure of a schema definition.
 
-    # Add modifier and number if provided
-    if modifier is not None and modifier_num is not None:
-        version += f"-{modifier}.{modifier_num}"
+    Descriptions and key order do not contribute, so definitions that only
+    differ in their documentation hash alike. Properties that happen to be
+    named `description` are kept.
 
-    return version
+    Args:
+        schema: Schema definition
 
+    Returns:
+        SHA-256 digest of the canonical JSON form without descriptions
+    """
 
-def create_package_files(
-    output_dir: str, spec_names: List[str], specs: Dict[str, Dict[str, Any]]
-) -> None:
+    def strip(node: Any, in_properties: bool = False) -> Any:
+        if isinstance(node, dict):
+            return {
+                key: strip(value, not in_properties and key == "properties")
+                for key, value in node.items()
+                if in_properties or key != "description"
+            }
+        if isinstance(node, list):
+            return [strip(item) for item in node]
+        return node
+
+    return schema_digest(strip(schema))
+
+
+def find_shared_schemas(
+    schemas: Dict[str, Dict[str, Any]],
+) -> Dict[str, List[str]]:
     """
-    Create package files (__init__.py) for the models package.
+    Find the schemas that several specifications define identically.
+
+    For every name, the largest group of specifications with the same
+    `structural_digest` is a candidate. Groups are then narrowed until each
+    schema only references schemas that are shared by the same
+    specifications, so a shared model never depends on a local one.
 
     Args:
-        output_dir: Directory for the models package
-        spec_names: List of specification names
-        specs: Dictionary containing the full specifications with version info
-    """
-    # Create __init__.py with imports and version info
-    init_path = os.path.join(output_dir, "__init__.py")
-    with open(init_path, "w", encoding="utf-8") as fp:
-        fp.write('"""Iconik API models package."""\n\n')
+        schemas: Dictionary mapping specification names to their component
+            schemas
 
-        # Import all modules
-        for spec_name in spec_names:
-            module_name = spec_name.replace("-", "_")
-            fp.write(f"from . import {module_name}\n")
-
-        # Package version using calendar versioning
-        version = get_calendar_version()
-        fp.write("# Package version (YYYY.M format)\n")
-        fp.write(f'__version__ = "{version}"\n\n')
-
-        # Document versioning scheme
-        fp.write('"""\n')
-        fp.write("This project uses calendar-based versioning in the format\n")
-        fp.write("`YYYY.M[.P][-modifier.N]` where:\n")
-        fp.write("\n")
-        fp.write("- `YYYY` - Four-digit year\n")
-        fp.write("- `M` - Month number (1-12)\n")
-        fp.write("- `P` - (Optional) Sequential patch number\n")
-        fp.write(
-            "- `modifier` - (Optional) Pre-release identifier (alpha/beta/rc)\n"
-        )
-        fp.write("- `N` - (Optional) Pre-release sequence number\n")
-        fp.write("\n")
-        fp.write("Examples:\n")
-        fp.write("\n")
-        fp.write("2025.5          -> May 2025 release\n")
-        fp.write("2025.5.1        -> May 2025 patch 1\n")
-        fp.write("2025.5-alpha.1  -> First alpha release for May 2025\n")
-        fp.write("2025.5-beta.1   -> First beta release for May 2025\n")
-        fp.write("2025.5-rc.1     -> First release candidate for May 2025\n")
-        fp.write('"""\n\n')
-
-        # Add API information with detailed metadata
-        fp.write("# API specification information\n")
-        fp.write("__info__ = {\n")
+    Returns:
+        Dictionary mapping shared schema names to the specifications that
+            define them in `SPEC_NAMES` order; the first one is canonical
+    """
+    owners: Dict[str, List[str]] = {}
+    for spec_name in sorted(schemas, key=spec_rank):
+        for schema_name in schemas[spec_name]:
+            owners.setdefault(schema_name, []).append(spec_name)
+
+    shared = {}
+    for schema_name, spec_names in owners.items():
+        if len(spec_names) < 2:
+            continue
 
+        groups: Dict[bytes, List[str]] = {}
         for spec_name in spec_names:
-            module_name = spec_name.replace("-", "_")
-
-            # Extract info from spec
-            version = "unknown"
-            openapi_version = "unknown"
-            title = f"Iconik {spec_name.capitalize()}"
+            digest = structural_digest(schemas[spec_name][schema_name])
+            groups.setdefault(digest, []).append(spec_name)
+
+        # The largest group wins; ties go to the earliest specification
+        group = max(groups.values(), key=len)
+        if len(group) > 1:
+            shared[schema_name] = group
+
+    changed = True
+    while changed:
+        changed = False
+        for schema_name, group in list(shared.items()):
+            refs = collect_schema_refs(schemas[group[0]][schema_name])
+            narrowed = [
+                spec_name for spec_name in group
+                if all(spec_name in shared.get(ref, ()) for ref in refs)
+            ]
+            if len(narrowed) < 2:
+                del shared[schema_name]
+                changed = True
+            elif len(narrowed) < len(group):
+                shared[schema_name] = narrowed
+                changed = True
+
+    return shared
+
+
+def collect_schema_refs(schema: Any) -> Set[str]:
+    """
+    Collect the names of all schemas referenced from a schema.
 
-            if spec_name in specs and "info" in specs[spec_name]:
-                spec_info = specs[spec_name]["info"]
-                if "version" in spec_info:
-                    version = spec_info["version"]
-                if "title" in spec_info:
-                    title = spec_info["title"]
+    Args:
+        schema: The schema to scan
 
-            # Get OpenAPI version
-            if spec_name in specs and "openapi" in specs[spec_name]:
-                openapi_version = specs[spec_name]["openapi"]
+    Returns:
+        Set of referenced schema names
+    """
+    refs = set()
+    stack = [schema]
 
-            fp.write(f'    "{module_name}": {{\n')
-            fp.write(f'        "version": "{version}",\n')
-            fp.write(f'        "openapi": "{openapi_version}",\n')
-            fp.write(f'        "title": "{title}"\n')
-            fp.write("    },\n")
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                refs.add(ref.split("/")[-1])
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
 
-        fp.write("}\n\n")
+    return refs
 
-        fp.write("\n__all__ = [\n")
-        fp.write('    "__version__",\n')
-        fp.write('    "__info__",\n')
 
-        for spec_name in spec_names:
-            module_name = spec_name.replace("-", "_")
-            fp.write(f'    "{module_name}",\n')
+def copy_json(value: Any) -> Any:
+    """
+    Copy the dicts and lists of a parsed JSON structure.
 
-        fp.write("]\n")
+    Args:
+        value: Parsed JSON value
 
-    logger.info("Created init file: %s", init_path)
+    Returns:
+        Equal value that shares no dicts or lists with the input
+    """
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
 
 
-def format_generated_code(output_dir: str, format_code: bool = False) -> None:
+def parse_schema_ref(ref: str) -> Optional[str]:
     """
-    Format the generated Python code using common linting tools.
+    Get the schema name of a local `#/components/schemas/<name>` reference.
 
     Args:
-        output_dir: Directory containing the generated code
-        format_code: Whether to format the code
+        ref: Value of a `$ref`
+
+    Returns:
+        Referenced schema name, or None for any other kind of reference
     """
-    if not format_code:
-        logger.info("Skipping code formatting. Use --format-code to enable.")
-        return
+    ref_parts = ref.split("/")
+    if len(ref_parts) < 4 or ref_parts[:3] != ["#", "components", "schemas"]:
+        return None
+    return ref_parts[3]
 
-    formatters = [
-        {
-            "name": "pycln",
+
+def resolve_schema_references(
+    schema: Dict[str, Any],
+    all_schemas: Dict[str, Dict[str, Any]],
+    memo: Optional[Dict[str, Dict[str, Any]]] = None,
+    share: bool = False,
+) -> Dict[str, Any]:
+    """
+    Resolve $ref references in the schema.
+
+    Every referenced schema is resolved once and kept in `memo` under its
+    name, so pass the same `memo` to later calls with the same
+    `all_schemas` to reuse the work across schemas. A reference to a schema
+    that is still being resolved is a cycle and is left in place as a `$ref`
+    marker; schemas whose result was cut short by a cycle through a schema
+    further up the chain are not memoized, since resolving them on their own
+    inlines it. By default the result is copied so it shares nothing with
+    `memo`; with `share` the resolved subtrees are shared between use sites
+    and with `memo`, so the result must not be modified.
+
+    Args:
+        schema: The schema to resolve references in
+        all_schemas: Dictionary of all schemas, keyed by name
+        memo: Resolved schemas keyed by name, shared between calls
+        share: Whether to share resolved subtrees instead of copying them
+
+    Returns:
+        Schema with references resolved
+    """
+    if memo is None:
+        memo = {}
+    # Depth of each schema being resolved in the current chain of references
+    resolving: Dict[str, int] = {}
+    # For each schema being resolved, the shallowest depth of the cycles its
+    # result was cut short at
+    cut_at: List[int] = []
+
+    def resolve_ref(ref_name: str) -> Dict[str, Any]:
+        if ref_name in memo:
+            return memo[ref_name]
+
+        depth = len(resolving)
+        resolving[ref_name] = depth
+        cut_at.append(depth)
+        resolved = resolve(all_schemas[ref_name])
+        del resolving[ref_name]
+        cut = cut_at.pop()
+
+        # A result cut short at a schema further up the chain differs from
+        # the one resolved on its own, so only complete results are kept
+        if cut == depth:
+            memo[ref_name] = resolved
+        else:
+            cut_at[-1] = min(cut_at[-1], cut)
+        return resolved
+
+    def resolve(node: Dict[str, Any]) -> Dict[str, Any]:
+        # Create a new schema to avoid modifying the input
+        resolved: Dict[str, Any] = {}
+
+        for key, value in node.items():
+            if key == "$ref" and isinstance(value, str):
+                ref_name = parse_schema_ref(value)
+                if ref_name is not None and ref_name not in all_schemas:
+                    logger.warning("Referenced schema not found: %s", ref_name)
+                    ref_name = None
+
+                if ref_name is None:
+                    # Keep unknown references as markers
+                    resolved[key] = value
+                elif ref_name in resolving:
+                    # Keep recursive references as markers
+                    resolved[key] = value
+                    cut_at[-1] = min(cut_at[-1], resolving[ref_name])
+                elif len(node) == 1:
+                    return resolve_ref(ref_name)
+                else:
+                    # Merge the referenced schema
+                    resolved.update(resolve_ref(ref_name))
+            elif isinstance(value, dict):
+                resolved[key] = resolve(value)
+            elif isinstance(value, list):
+                resolved[key] = [
+                    resolve(item) if isinstance(item, dict) else item
+                    for item in value
+                ]
+            else:
+                resolved[key] = value
+
+        return resolved
+
+    if not isinstance(schema, dict):
+        return schema
+
+    # Resolve with shared subtrees and copy the finished schema only once
+    resolved = resolve(schema)
+    if share:
+        return resolved
+    copied: Dict[str, Any] = copy_json(resolved)
+    return copied
+
+
+def flatten_all_of(
+    spec_schemas: Dict[str, Dict[str, Any]],
+    memo: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Flatten the allOf compositions of one specification's schemas.
+
+    A schema composed with allOf gets the merged `properties` and
+    `required` lists of its members, with its own keywords taking
+    precedence. Referenced bases are flattened once and kept in `memo`, so
+    deep composition chains cost linear time. A property whose allOf wraps
+    a single `$ref`, the usual way to add keywords such as `readOnly` to a
+    reference, becomes that `$ref`. Schemas without allOf are returned
+    unchanged and are not copied.
+
+    Args:
+        spec_schemas: Dictionary mapping schema names to schema definitions
+        memo: Flattened schemas keyed by name, shared between calls
+
+    Returns:
+        Dictionary mapping schema names to flattened schema definitions
+    """
+    if memo is None:
+        memo = {}
+    resolving: Set[str] = set()
+
+    def flatten_named(schema_name: str) -> Dict[str, Any]:
+        if schema_name not in memo:
+            resolving.add(schema_name)
+            memo[schema_name] = flatten_schema(spec_schemas[schema_name])
+            resolving.discard(schema_name)
+        return memo[schema_name]
+
+    def flatten_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+        if "allOf" not in schema:
+            return schema
+
+        members: List[Dict[str, Any]] = []
+        for member in schema["allOf"]:
+            ref_name = parse_schema_ref(member.get("$ref", ""))
+            if ref_name in resolving:
+                logger.warning("Skipping cyclic allOf base: %s", ref_name)
+                continue
+            if ref_name in spec_schemas:
+                members.append(flatten_named(ref_name))
+            elif "$ref" in member:
+                logger.warning(
+                    "Skipping allOf base not found in the specification: %s",
+                    member["$ref"],
+                )
+            else:
+                members.append(flatten_schema(member))
+
+        # The schema's own keywords come last so they take precedence
+        own = {key: value for key, value in schema.items() if key != "allOf"}
+        members.append(own)
+
+        merged: Dict[str, Any] = {}
+        properties: Dict[str, Any] = {}
+        required: List[str] = []
+        for member in members:
+            properties.update(member.get("properties", {}))
+            required.extend(
+                name for name in member.get("required", [])
+                if name not in required
+            )
+            for key, value in member.items():
+                if key in ("properties", "required", "$ref"):
+                    continue
+                # Documentation of a base does not describe the composition
+                if member is own or key not in ("title", "description"):
+                    merged[key] = value
+
+        if properties:
+            merged["properties"] = properties
+            merged.setdefault("type", "object")
+        if required:
+            merged["required"] = required
+
+        return merged
+
+    def flatten_property(schema: Dict[str, Any]) -> Dict[str, Any]:
+        if "allOf" in schema:
+            members = schema["allOf"]
+            if len(members) == 1 and "$ref" in members[0]:
+                flattened = {
+                    key: value
+                    for key, value in schema.items()
+                    if key != "allOf"
+                }
+                flattened["$ref"] = members[0]["$ref"]
+                return flattened
+            return flatten_schema(schema)
+
+        items = schema.get("items")
+        if isinstance(items, dict) and "allOf" in items:
+            return {**schema, "items": flatten_property(items)}
+
+        return schema
+
+    flattened = {}
+    for schema_name, schema in spec_schemas.items():
+        schema = flatten_named(schema_name)
+
+        properties = schema.get("properties")
+        if isinstance(properties, dict) and any(
+            "allOf" in prop or "allOf" in prop.get("items", {})
+            for prop in properties.values()
+        ):
+            schema = {
+                **schema,
+                "properties": {
+                    name: flatten_property(prop)
+                    for name, prop in properties.items()
+                },
+            }
+
+        flattened[schema_name] = schema
+
+    return flattened
+
+
+# An imported symbol of a generated module: (module, name)
+Import = Tuple[str, str]
+
+# Canonical instances of the import sets recorded in the IR, keyed by
+# themselves and by the tuples of sets they merge, so the many fields that
+# need the same imports share one set and merging them is a lookup
+IMPORT_SETS: Dict[Any, FrozenSet[Import]] = {}
+
+# Import sets shared by many nodes of the IR
+NO_IMPORTS: FrozenSet[Import] = frozenset()
+OPTIONAL_IMPORTS = frozenset([("typing", "Optional")])
+FIELD_IMPORTS = frozenset([("pydantic", "Field")])
+BASE_MODEL_IMPORTS = frozenset([("pydantic", "BaseModel")])
+UNION_IMPORTS = frozenset([("typing", "Union")])
+LITERAL_IMPORTS = frozenset([("typing", "Literal")])
+
+
+def merge_imports(*groups: FrozenSet[Import]) -> FrozenSet[Import]:
+    """
+    Merge sets of imported symbols into a shared set.
+
+    Args:
+        *groups: Sets of (module, name) tuples
+
+    Returns:
+        Canonical set of the (module, name) tuples
+    """
+    imports = IMPORT_SETS.get(groups)
+    if imports is None:
+        imports = frozenset().union(*groups)
+        imports = IMPORT_SETS.setdefault(imports, imports)
+        IMPORT_SETS[groups] = imports
+    return imports
+
+
+# The type nodes, fields and models declare the `imports` that __post_init__
+# sets for type checkers only, as a class attribute would clash with its slot
+# pylint: disable=class-variable-slots-conflict
+@dataclass
+class TypeRef:
+    """
+    A named type in a model's intermediate representation.
+
+    `name` is a built-in or library type such as `str`, `List` or
+    `datetime`, imported from `module` unless that is None, with its type
+    arguments in `args`, or the name of a component schema when `ref` is
+    set. Schema names defined later in the same module are rendered as
+    string literal forward references when `forward` is set. The symbols the
+    type needs, including those of its arguments, are recorded in `imports`.
+    """
+
+    __slots__ = ("name", "args", "module", "ref", "forward", "imports")
+
+    name: str
+    args: Tuple["TypeNode", ...]
+    module: Optional[str]
+    ref: bool
+    forward: bool
+
+    if TYPE_CHECKING:
+        imports: FrozenSet[Import] = dataclass_field(init=False)
+
+    def __post_init__(self) -> None:
+        imports = (
+            frozenset([(self.module, self.name)]) if self.module else NO_IMPORTS
+        )
+        if self.args:
+            imports = merge_imports(
+                imports, *[arg.imports for arg in self.args]
+            )
+        self.imports = imports
+
+    def render(self) -> str:
+        """Render the type as a Python type hint."""
+        if self.forward:
+            return f"'{self.name}'"
+        if self.args:
+            return f"{self.name}[{', '.join(a.render() for a in self.args)}]"
+        return self.name
+
+
+@dataclass
+class TypeUnion:
+    """The members of a oneOf or anyOf, rendered as a `Union`."""
+
+    __slots__ = ("members", "imports")
+
+    members: Tuple["TypeNode", ...]
+
+    if TYPE_CHECKING:
+        imports: FrozenSet[Import] = dataclass_field(init=False)
+
+    def __post_init__(self) -> None:
+        self.imports = merge_imports(
+            UNION_IMPORTS, *[member.imports for member in self.members]
+        )
+
+    def render(self) -> str:
+        """Render the type as a Python type hint."""
+        return f"Union[{', '.join(m.render() for m in self.members)}]"
+
+
+@dataclass
+class TypeLiteral:
+    """The values of an enum, rendered as a `Literal`."""
+
+    __slots__ = ("values", "imports")
+
+    values: Tuple[Any, ...]
+
+    if TYPE_CHECKING:
+        imports: FrozenSet[Import] = dataclass_field(init=False)
+
+    def __post_init__(self) -> None:
+        self.imports = LITERAL_IMPORTS
+
+    def render(self) -> str:
+        """Render the type as a Python type hint."""
+        return f"Literal[{', '.join([repr(v) for v in self.values])}]"
+
+
+# A node of the type tree of a field or type alias
+TypeNode = Union[TypeRef, TypeUnion, TypeLiteral]
+
+
+def iter_type_refs(*annotations: TypeNode) -> Iterator[TypeRef]:
+    """
+    Yield the component schema references within type trees.
+
+    Args:
+        *annotations: Type nodes to walk
+
+    Yields:
+        Schema reference nodes, in no particular order
+    """
+    stack = list(annotations)
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, TypeRef):
+            if node.ref:
+                yield node
+            stack.extend(node.args)
+        elif isinstance(node, TypeUnion):
+            stack.extend(node.members)
+
+
+@dataclass
+class Field:
+    """
+    A field of a generated model.
+
+    The type of an optional field is rendered wrapped in `Optional`.
+    `default` is the rendered right-hand side of the field, such as `None`
+    or `Field(..., alias="x-id")`, or None for a required field without one.
+    The symbols the field needs are recorded in `imports`.
+    """
+
+    __slots__ = ("name", "annotation", "required", "default", "imports")
+
+    name: str
+    annotation: TypeNode
+    required: bool
+    default: Optional[str]
+
+    if TYPE_CHECKING:
+        imports: FrozenSet[Import] = dataclass_field(init=False)
+
+    def __post_init__(self) -> None:
+        self.imports = merge_imports(
+            self.annotation.imports,
+            NO_IMPORTS if self.required else OPTIONAL_IMPORTS,
+            FIELD_IMPORTS if self.default and self.default.startswith("Field(")
+            else NO_IMPORTS,
+        )
+
+    def render(self) -> str:
+        """Render the type of the field as a Python type hint."""
+        if self.required:
+            return self.annotation.render()
+        return f"Optional[{self.annotation.render()}]"
+
+
+@dataclass
+class Model:
+    """
+    A generated model class, or a type alias when `type_alias` is set.
+
+    Fields are keyed by their Python name in property order. The symbols
+    the model needs are recorded in `imports`, so a module's imports are
+    the union of its models'.
+    """
+
+    __slots__ = (
+        "name", "description", "fields", "config", "type_alias", "imports"
+    )
+
+    name: str
+    description: str
+    fields: Dict[str, Field]
+    config: Dict[str, str]
+    type_alias: Optional[TypeNode]
+
+    if TYPE_CHECKING:
+        imports: FrozenSet[Import] = dataclass_field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.type_alias is not None:
+            self.imports = self.type_alias.imports
+        else:
+            # Each distinct field import set is merged once
+            self.imports = merge_imports(
+                BASE_MODEL_IMPORTS,
+                *dict.fromkeys(field.imports for field in self.fields.values()),
+            )
+
+    def iter_refs(self) -> Iterator[TypeRef]:
+        """Yield the component schema references of the type or fields."""
+        if self.type_alias is not None:
+            return iter_type_refs(self.type_alias)
+        return iter_type_refs(
+            *[field.annotation for field in self.fields.values()]
+        )
+
+
+# pylint: enable=class-variable-slots-conflict
+
+
+def named_type(
+    name: str, *args: TypeNode, module: Optional[str] = "typing"
+) -> TypeRef:
+    """
+    Build a built-in or library type.
+
+    Args:
+        name: Type name, such as `str` or `List`
+        *args: Type arguments
+        module: Module to import the name from, or None for built-ins
+
+    Returns:
+        Type node
+    """
+    return TypeRef(name, args, module, False, False)
+
+
+def schema_type(ref: str, model_names: Set[str]) -> TypeRef:
+    """
+    Build a reference to a component schema.
+
+    Args:
+        ref: The `$ref` value
+        model_names: Set of model names to check for forward references
+
+    Returns:
+        Type node, a forward reference if the schema is in `model_names`
+    """
+    ref_name = ref.split("/")[-1]
+    return TypeRef(ref_name, (), None, True, ref_name in model_names)
+
+
+# Shared nodes of the types without arguments, with their modules
+PRIMITIVE_TYPES = {
+    name: named_type(name, module=module)
+    for name, module in (
+        ("Any", "typing"),
+        ("HttpUrl", "pydantic"),
+        ("UUID", "uuid"),
+        ("bool", None),
+        ("date", "datetime"),
+        ("datetime", "datetime"),
+        ("float", None),
+        ("int", None),
+        ("str", None),
+    )
+}
+
+# Shared node of an untyped object
+DICT_TYPE = named_type("Dict", PRIMITIVE_TYPES["str"], PRIMITIVE_TYPES["Any"])
+
+# Python types of OpenAPI (type, format) pairs; a None format is the
+# fallback for formats without their own entry
+DEFAULT_TYPE_MAPPINGS: Dict[Tuple[str, Optional[str]], TypeNode] = {
+    ("string", None): PRIMITIVE_TYPES["str"],
+    ("string", "date-time"): PRIMITIVE_TYPES["datetime"],
+    ("string", "date"): PRIMITIVE_TYPES["date"],
+    ("string", "uuid"): PRIMITIVE_TYPES["UUID"],
+    ("string", "uri"): PRIMITIVE_TYPES["HttpUrl"],
+    ("string", "url"): PRIMITIVE_TYPES["HttpUrl"],
+    # Using int for both int32 and int64
+    ("integer", None): PRIMITIVE_TYPES["int"],
+    ("number", None): PRIMITIVE_TYPES["float"],
+    ("boolean", None): PRIMITIVE_TYPES["bool"],
+    ("object", None): DICT_TYPE,
+}
+
+
+def parse_type_target(target: str) -> TypeRef:
+    """
+    Parse the Python type of a type mapping override.
+
+    Args:
+        target: A built-in name such as `str`, or a dotted name such as
+            `pydantic.AnyUrl` to import the last part from the module
+
+    Returns:
+        Type node
+
+    Raises:
+        ValueError: If the target is not a (dotted) Python identifier
+    """
+    module, _, name = target.rpartition(".")
+    if not all(part.isidentifier() for part in target.split(".")):
+        raise ValueError(f"Invalid Python type: {target!r}")
+    return named_type(name, module=module or None)
+
+
+class TypeMapping:
+    """
+    Registry of the Python types generated for OpenAPI types and formats.
+
+    A (type, format) pair maps to its own entry if there is one, otherwise
+    to the entry of the type without a format, and to `Any` for unknown
+    types. Overrides use `"type"` or `"type:format"` keys and Python type
+    values, for example `{"string:uri": "str"}` to skip URL validation.
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, str]] = None) -> None:
+        self.types = dict(DEFAULT_TYPE_MAPPINGS)
+        self.overrides = dict(sorted((overrides or {}).items()))
+        for key, target in self.overrides.items():
+            openapi_type, _, openapi_format = key.partition(":")
+            type_key = (openapi_type, openapi_format or None)
+            self.types[type_key] = parse_type_target(target)
+
+    @classmethod
+    def from_file(cls, path: str) -> "TypeMapping":
+        """
+        Load type mapping overrides from a JSON file.
+
+        Args:
+            path: Path of a JSON object mapping `type[:format]` keys to
+                Python types
+
+        Returns:
+            Type mapping with the overrides applied
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid override object
+        """
+        with open(path, "rb") as fp:
+            overrides = json_loads(fp.read())
+
+        if not isinstance(overrides, dict) or not all(
+            isinstance(target, str) for target in overrides.values()
+        ):
+            raise ValueError(f"{path} must hold a JSON object of type names")
+
+        return cls(overrides)
+
+    def lookup(
+        self,
+        openapi_type: str,
+        openapi_format: Optional[str] = None
+    ) -> TypeNode:
+        """
+        Look up the Python type of an OpenAPI type and format.
+
+        Args:
+            openapi_type: The OpenAPI type
+            openapi_format: The OpenAPI format
+
+        Returns:
+            Python type as a type node
+        """
+        annotation = self.types.get((openapi_type, openapi_format))
+        if annotation is None:
+            annotation = self.types.get((openapi_type, None),
+                                        PRIMITIVE_TYPES["Any"])
+        return annotation
+
+    def digest(self) -> str:
+        """Return a SHA-256 of the overrides, empty for the defaults."""
+        if not self.overrides:
+            return ""
+        return hashlib.sha256(
+            json.dumps(self.overrides, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+
+# Type mapping without overrides
+DEFAULT_TYPE_MAPPING = TypeMapping()
+
+
+def openapi_type_to_python(
+    openapi_type: str,
+    openapi_format: Optional[str] = None,
+    is_array: bool = False,
+    ref: Optional[str] = None,
+    enum: Optional[List[Any]] = None,
+    *,
+    type_mapping: Optional[TypeMapping] = None,
+) -> TypeNode:
+    """
+    Convert OpenAPI type to Python type.
+
+    Args:
+        openapi_type: The OpenAPI type
+        openapi_format: The OpenAPI format
+        is_array: Whether the type is an array
+        ref: Reference to another schema
+        enum: Enumeration values
+        type_mapping: Registry of Python types, or None for the defaults
+
+    Returns:
+        Python type as a type node
+    """
+    annotation: TypeNode
+    if ref:
+        # Extract the model name from the reference
+        annotation = schema_type(ref, set())
+    elif enum:
+        # For enum types, use Literal
+        annotation = TypeLiteral(tuple(enum))
+    else:
+        type_mapping = type_mapping or DEFAULT_TYPE_MAPPING
+        annotation = type_mapping.lookup(openapi_type, openapi_format)
+
+    if is_array:
+        annotation = named_type("List", annotation)
+
+    return annotation
+
+
+# pylint: disable=unused-argument
+def handle_oneof_anyof(
+    schema: Dict[str, Any],
+    all_schemas: Dict[str, Dict[str, Any]],
+    model_names: Optional[Set[str]] = None,
+    type_mapping: Optional[TypeMapping] = None,
+) -> TypeNode:
+    """
+    Handle oneOf and anyOf in OpenAPI schemas.
+
+    Args:
+        schema: The schema containing oneOf or anyOf
+        all_schemas: Dictionary of all schemas
+        model_names: Set of model names to check for forward references
+        type_mapping: Registry of Python types, or None for the defaults
+
+    Returns:
+        Python type as a type node
+    """
+    if model_names is None:
+        model_names = set()
+
+    if "oneOf" in schema:
+        members = schema["oneOf"]
+    elif "anyOf" in schema:
+        members = schema["anyOf"]
+    else:
+        return PRIMITIVE_TYPES["Any"]
+
+    types: List[TypeNode] = []
+    for sub_schema in members:
+        if "$ref" in sub_schema:
+            # Use string literal for forward references
+            types.append(schema_type(sub_schema["$ref"], model_names))
+        else:
+            types.append(
+                openapi_type_to_python(
+                    sub_schema.get("type", "any"),
+                    sub_schema.get("format"),
+                    is_array=False,
+                    enum=sub_schema.get("enum"),
+                    type_mapping=type_mapping,
+                )
+            )
+
+    return TypeUnion(tuple(types))
+
+
+def generate_models(
+    schemas: Dict[str, Dict[str, Any]],
+    shared: Optional[Dict[str, List[str]]] = None,
+    type_mapping: Optional[TypeMapping] = None,
+) -> Dict[str, List[Model]]:
+    """
+    Generate Pydantic models from OpenAPI schemas.
+
+    Args:
+        schemas: Dictionary mapping specification names to their component
+            schemas
+        shared: Schemas emitted in the shared module, as returned by
+            `find_shared_schemas`; these are not generated again
+        type_mapping: Registry of Python types, or None for the defaults
+
+    Returns:
+        Dictionary mapping specification names to lists of model definitions
+    """
+    models_by_spec = {}
+
+    for spec_name, spec_schemas in schemas.items():
+        imported = frozenset(
+            schema_name for schema_name, spec_names in (shared or {}).items()
+            if spec_name in spec_names
+        )
+
+        # References resolve within the specification's own namespace
+        models_by_spec[spec_name] = generate_spec_models(
+            spec_schemas, imported, type_mapping
+        )
+
+    return models_by_spec
+
+
+def emits_model(schema: Dict[str, Any]) -> bool:
+    """
+    Check whether a component schema is generated as a model or type alias.
+
+    Args:
+        schema: OpenAPI schema definition
+
+    Returns:
+        True for oneOf/anyOf and object schemas
+    """
+    return (
+        "oneOf" in schema or "anyOf" in schema or schema.get("type") == "object"
+        or "properties" in schema
+    )
+
+
+def generate_spec_models(
+    spec_schemas: Dict[str, Any],
+    imported: FrozenSet[str] = frozenset(),
+    type_mapping: Optional[TypeMapping] = None,
+) -> List[Model]:
+    """
+    Generate Pydantic models for the component schemas of one specification.
+
+    References resolve within the specification's own schemas, so names
+    defined by several specifications never shadow each other.
+
+    Args:
+        spec_schemas: Dictionary mapping schema names to schema definitions
+        imported: Schema names that are imported from the shared module
+            instead of being generated
+        type_mapping: Registry of Python types, or None for the defaults
+
+    Returns:
+        List of model definitions sorted by dependency
+    """
+    models = []
+
+    # Merge allOf compositions into plain object schemas
+    spec_schemas = flatten_all_of(spec_schemas)
+
+    # Only references within a reference cycle, including a model's
+    # references to itself, are written as string literal forward references
+    model_names = set(spec_schemas.keys()) - imported
+    names = [name for name in spec_schemas if name in model_names]
+    cycles = {
+        name: set(component)
+        for component in find_model_components(
+            names, {
+                name: collect_schema_refs(spec_schemas[name]) & model_names
+                for name in names
+            }
+        )
+        for name in component
+    }
+
+    # Type aliases are evaluated on import, so their members are also
+    # quoted if they name a schema that no module defines as a model
+    defined = {
+        name
+        for name, schema in spec_schemas.items()
+        if emits_model(schema)
+    }
+
+    for model_name, schema in spec_schemas.items():
+        if model_name in imported:
+            continue
+
+        # Handle oneOf/anyOf at the top level
+        if "oneOf" in schema or "anyOf" in schema:
+            # Pass the model's cycle and the undefined names to
+            # handle_oneof_anyof to identify forward references
+            undefined = collect_schema_refs(schema) - defined
+            type_alias = handle_oneof_anyof(
+                schema, spec_schemas, cycles[model_name] | undefined,
+                type_mapping
+            )
+
+            models.append(
+                Model(
+                    model_name,
+                    schema.get("description", f"Type alias for {model_name}."),
+                    {},
+                    {},
+                    type_alias,
+                )
+            )
+            continue
+
+        # Skip non-object schemas
+        if not emits_model(schema):
+            logger.warning("Skipping non-object schema: %s", model_name)
+            continue
+
+        # Get required fields
+        required = schema.get("required", [])
+
+        # Process properties
+        properties = schema.get("properties", {})
+        fields = {}
+
+        for field_name, field_schema in properties.items():
+            field = generate_model_field(
+                field_name,
+                field_schema,
+                required,
+                cycles[model_name],
+                type_mapping,
+            )
+            fields[field.name] = field
+
+        # Add model configuration
+        config = {}
+
+        # Handle extra fields
+        if "additionalProperties" in schema:
+            config["extra"] = "allow"
+
+        # Create model definition
+        models.append(
+            Model(
+                model_name,
+                schema.get(
+                    "description",
+                    f"Represents a {model_name} in the Iconik system.",
+                ),
+                fields,
+                config,
+                None,
+            )
+        )
+
+    # Sort models by dependency
+    return sort_models_by_dependency(models)
+
+
+def generate_model_field(
+    field_name: str,
+    schema: Dict[str, Any],
+    required: List[str],
+    model_names: Optional[Set[str]] = None,
+    type_mapping: Optional[TypeMapping] = None,
+) -> Field:
+    """
+    Generate a Pydantic field definition from an OpenAPI schema property.
+
+    Args:
+        field_name: Name of the field
+        schema: OpenAPI schema for the field
+        required: List of required field names
+        model_names: Set of model names to check for forward references
+        type_mapping: Registry of Python types, or None for the defaults
+
+    Returns:
+        Field definition
+    """
+    if model_names is None:
+        model_names = set()
+
+    # Store the original field name for potential use as an alias
+    original_field_name = field_name
+
+    # Check if field name contains dashes or other invalid characters
+    has_invalid_chars = "-" in field_name or field_name.startswith("x-")
+
+    # Convert dashed names to underscore
+    if has_invalid_chars:
+        # For fields starting with x-, keep the x_ prefix
+        if field_name.startswith("x-"):
+            field_name = "x_" + field_name[2:].replace("-", "_")
+        else:
+            field_name = field_name.replace("-", "_")
+
+    # Convert Python keywords
+    if field_name in PYTHON_KEYWORDS:
+        field_name = f"{field_name}_"
+
+    is_required = original_field_name in required
+
+    # Handle references and oneOf/anyOf
+    if "$ref" in schema or "oneOf" in schema or "anyOf" in schema:
+        if "$ref" in schema:
+            # Use string literals for forward references
+            annotation: TypeNode = schema_type(schema["$ref"], model_names)
+        else:
+            annotation = handle_oneof_anyof(
+                schema, {}, model_names, type_mapping
+            )
+
+        default = "None" if not is_required else None
+
+        # Add alias if the field name has been changed
+        if has_invalid_chars:
+            if default is None:
+                default = f'Field(..., alias="{original_field_name}")'
+            else:
+                default = f'Field(None, alias="{original_field_name}")'
+
+        return Field(field_name, annotation, is_required, default)
+
+    # Handle arrays
+    if schema.get("type") == "array":
+        items = schema.get("items", {})
+        if "$ref" in items:
+            # Use string literals for forward references
+            item_type: TypeNode = schema_type(items["$ref"], model_names)
+        else:
+            item_type = openapi_type_to_python(
+                items.get("type", "any"),
+                items.get("format"),
+                enum=items.get("enum"),
+                type_mapping=type_mapping,
+            )
+
+        default = "Field(default_factory=list)"
+        if has_invalid_chars:
+            default = f'Field(default_factory=list, alias="{original_field_name}")'  # pylint: disable=line-too-long
+
+        if is_required:
+            if has_invalid_chars:
+                default = f'Field(..., alias="{original_field_name}")'
+            else:
+                default = None
+
+        return Field(
+            field_name, named_type("List", item_type), is_required, default
+        )
+
+    # Handle objects
+    if schema.get("type") == "object":
+        if "additionalProperties" in schema:
+            if "$ref" in schema["additionalProperties"]:
+                # Use string literals for forward references
+                value_type: TypeNode = schema_type(
+                    schema["additionalProperties"]["$ref"], model_names
+                )
+            else:
+                value_type = openapi_type_to_python(
+                    schema["additionalProperties"].get("type", "any"),
+                    schema["additionalProperties"].get("format"),
+                    type_mapping=type_mapping,
+                )
+
+            annotation = named_type("Dict", PRIMITIVE_TYPES["str"], value_type)
+        else:
+            annotation = DICT_TYPE
+
+        default = "Field(default_factory=dict)"
+        if has_invalid_chars:
+            default = f'Field(default_factory=dict, alias="{original_field_name}")'  # pylint: disable=line-too-long
+
+        if is_required:
+            if has_invalid_chars:
+                default = f'Field(..., alias="{original_field_name}")'
+            else:
+                default = None
+
+        return Field(field_name, annotation, is_required, default)
+
+    # Handle other types
+    annotation = openapi_type_to_python(
+        schema.get("type", "any"),
+        schema.get("format"),
+        enum=schema.get("enum"),
+        type_mapping=type_mapping,
+    )
+
+    # Start building constraints list, beginning with an alias if needed
+    constraints = []
+    if has_invalid_chars:
+        constraints.append(f'alias="{original_field_name}"')
+
+    # Handle patterns and constraints
+    if schema.get("pattern"):
+        pattern = schema["pattern"]
+        constraints.append(f'pattern="{pattern}"')
+
+    # Handle min/max
+    if schema.get("minimum") is not None:
+        constraints.append(f"ge={schema['minimum']}")
+    if schema.get("maximum") is not None:
+        constraints.append(f"le={schema['maximum']}")
+
+    # Handle min/max length
+    if schema.get("minLength") is not None:
+        constraints.append(f"min_length={schema['minLength']}")
+    if schema.get("maxLength") is not None:
+        constraints.append(f"max_length={schema['maxLength']}")
+
+    # Handle min/max items
+    if schema.get("minItems") is not None:
+        constraints.append(f"min_items={schema['minItems']}")
+    if schema.get("maxItems") is not None:
+        constraints.append(f"max_items={schema['maxItems']}")
+
+    # Add description if available
+    if schema.get("description"):
+        description = schema["description"].replace('"', '\\"')
+        constraints.append(f'description="{description}"')
+
+    if constraints:
+        constraints_str = ", ".join(constraints)
+
+        if is_required:
+            default = f"Field(..., {constraints_str})"
+        else:
+            default = f"Field(None, {constraints_str})"
+    else:
+        default = "None" if not is_required else None
+
+    return Field(field_name, annotation, is_required, default)
+
+
+def collect_model_dependencies(models: List[Model]) -> Dict[str, Set[str]]:
+    """
+    Collect dependencies between models.
+
+    Dependencies are the schema references in the type trees of each type
+    alias and field, so every edge is an actual `$ref` target and the cost
+    is linear in the number of fields.
+
+    Args:
+        models: List of model definitions
+
+    Returns:
+        Dictionary mapping model names to sets of dependent model names
+    """
+    model_names = {model.name for model in models}
+    dependencies = {}
+
+    for model in models:
+        refs = {ref.name for ref in model.iter_refs()}
+        refs.discard(model.name)
+        dependencies[model.name] = refs & model_names
+
+    return dependencies
+
+
+def find_model_components(names: List[str],
+                          dependencies: Dict[str, Set[str]]) -> List[List[str]]:
+    """
+    Group models into strongly connected components in dependency order.
+
+    This is an iterative version of Tarjan's algorithm, so arbitrarily deep
+    reference chains never hit the recursion limit. Every component comes
+    after the components it depends on; a component with more than one
+    model is a reference cycle. Models and their dependencies are visited in
+    `names` order, so the result does not depend on set iteration order.
+
+    Args:
+        names: Model names in their original order
+        dependencies: Dictionary mapping model names to the names they
+            depend on
+
+    Returns:
+        List of components, each a list of model names in `names` order
+    """
+    positions = {name: position for position, name in enumerate(names)}
+    edges = [
+        sorted(
+            positions[dep]
+            for dep in dependencies.get(name, ())
+            if dep in positions
+        )
+        for name in names
+    ]
+
+    index = [-1] * len(names)
+    lowlink = [0] * len(names)
+    on_stack = [False] * len(names)
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(len(names)):
+        if index[root] != -1:
+            continue
+
+        # Each work item is (node, position of the next edge to follow)
+        work = [(root, 0)]
+        while work:
+            node, position = work.pop()
+            if position == 0:
+                index[node] = lowlink[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = True
+
+            # Descend into the next unvisited dependency, if any
+            child = -1
+            while position < len(edges[node]) and child == -1:
+                dep = edges[node][position]
+                position += 1
+                if index[dep] == -1:
+                    child = dep
+                elif on_stack[dep]:
+                    lowlink[node] = min(lowlink[node], index[dep])
+            if child != -1:
+                work.append((node, position))
+                work.append((child, 0))
+                continue
+
+            if lowlink[node] == index[node]:
+                component = []
+                member = -1
+                while member != node:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                components.append([
+                    names[member] for member in sorted(component)
+                ])
+
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+    return components
+
+
+def sort_models_by_dependency(models: List[Model]) -> List[Model]:
+    """
+    Sort models by dependency order so referenced models come first.
+
+    Models are emitted after the models they reference, so only references
+    within a cycle have to be resolved later. The cyclic groups are logged.
+
+    Args:
+        models: List of model definitions
+
+    Returns:
+        Sorted list of model definitions
+    """
+    models_by_name = {model.name: model for model in models}
+    components = find_model_components(
+        list(models_by_name), collect_model_dependencies(models)
+    )
+
+    cycles = [component for component in components if len(component) > 1]
+    if cycles:
+        logger.info(
+            "Found %d cyclic model group(s) needing deferred resolution: %s",
+            len(cycles),
+            "; ".join(" <-> ".join(component) for component in cycles),
+        )
+
+    return [
+        models_by_name[name] for component in components for name in component
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def get_model_template(
+    bytecode_cache_dir: Optional[str] = None,
+) -> "jinja2.Template":
+    """
+    Compile the model template once per process.
+
+    `jinja2` is imported here rather than at module level so that runs
+    whose modules are all up to date, or that use the direct emitter,
+    do not pay for importing it.
+
+    Args:
+        bytecode_cache_dir: Directory in which Jinja caches the compiled
+            template across runs, or None to compile it in memory only
+
+    Returns:
+        Compiled template
+    """
+    # pylint: disable=import-outside-toplevel
+    from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+
+    bytecode_cache = None
+    if bytecode_cache_dir:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+    env = Environment(
+        loader=DictLoader({MODEL_TEMPLATE_NAME: MODEL_TEMPLATE}),
+        bytecode_cache=bytecode_cache,
+    )
+    return env.get_template(MODEL_TEMPLATE_NAME)
+
+
+def render_model_code(
+    models: List[Model],
+    fp: TextIO,
+    bytecode_cache_dir: Optional[str] = None
+) -> None:
+    """
+    Stream the model template's output for the models to a file.
+
+    Args:
+        models: List of model definitions
+        fp: Text file to write the code to
+        bytecode_cache_dir: Directory of the template bytecode cache, or None
+    """
+    fp.writelines(
+        get_model_template(bytecode_cache_dir).generate(models=models)
+    )
+
+
+def emit_model_code(models: List[Model], fp: TextIO) -> None:
+    """
+    Write the code of the models without a template.
+
+    The output is identical to `render_model_code`, including the blank
+    lines the template's block tags leave behind.
+
+    Args:
+        models: List of model definitions
+        fp: Text file to write the code to
+    """
+    write = fp.write
+    write("\n")
+
+    for model in models:
+        if model.type_alias is not None:
+            write(
+                f"\n\n# {model.description}\n"
+                f"{model.name} = {model.type_alias.render()}\n\n"
+            )
+            continue
+
+        write(
+            f'\n\nclass {model.name}(BaseModel):\n    """{model.description}"""'
+            "\n    "
+        )
+        for field in model.fields.values():
+            if field.default is None:
+                write(f"\n    {field.name}: {field.render()}\n    ")
+            else:
+                write(
+                    f"\n    {field.name}: {field.render()} = {field.default}"
+                    "\n    "
+                )
+        write("\n    ")
+
+        if model.config:
+            write("\n\n    class Config:\n        ")
+            for key, value in model.config.items():
+                write(f"\n        {key} = {value}\n        ")
+            write("\n    ")
+
+        write("\n\n")
+
+
+def generate_model_code(models: List[Model]) -> str:
+    """
+    Generate Python code for Pydantic models.
+
+    Args:
+        models: List of model definitions
+
+    Returns:
+        Python code as a string
+    """
+    return get_model_template().render(models=models)
+
+
+# Functions writing the code of a module's models, by --emitter choice
+EMITTERS: Dict[str, Callable[[List[Model], TextIO], None]] = {
+    "jinja": render_model_code,
+    "direct": emit_model_code,
+}
+
+
+def get_module_path(spec_name: str) -> str:
+    """
+    Get the path of a specification's module within the models package.
+
+    Args:
+        spec_name: Name of the specification, or `COMMON_MODULE`
+
+    Returns:
+        Module file name, relative to the package directory
+    """
+    return f"{spec_name.replace('-', '_')}.py"
+
+
+def write_source_file(output_dir: str, module_path: str, source: str) -> bool:
+    """
+    Write a generated source file into the models package.
+
+    A file whose content is already identical is left untouched, keeping
+    its modification time and bytecode cache valid. Changed files are
+    written to a temporary file and renamed over the old one, so readers
+    never see a partial module.
+
+    Args:
+        output_dir: Directory of the models package
+        module_path: File name, relative to the package directory
+        source: Content of the file
+
+    Returns:
+        True if the file was written, False if it was unchanged
+    """
+    path = os.path.join(output_dir, module_path)
+    content = source.encode("utf-8")
+    if hashlib.sha256(content).hexdigest() == file_sha256(path):
+        logger.debug("Unchanged file: %s", path)
+        return False
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as fp:
+        fp.write(content)
+    os.replace(temp_path, path)
+
+    logger.info("Created file: %s", path)
+    return True
+
+
+def replace_changed_file(temp_path: str, path: str) -> bool:
+    """
+    Rename a file over another one unless their content is identical.
+
+    Args:
+        temp_path: Path of the new file, on the same filesystem as `path`
+        path: Path of the file to replace
+
+    Returns:
+        True if the file was replaced, False if it was unchanged and the new
+            file was removed
+    """
+    if file_sha256(temp_path) == file_sha256(path):
+        os.remove(temp_path)
+        logger.debug("Unchanged file: %s", path)
+        return False
+
+    os.replace(temp_path, path)
+    logger.info("Created file: %s", path)
+    return True
+
+
+class SourceWriter:
+    """
+    Writer of generated sources that counts written and unchanged files.
+
+    Instances are the `write_source` callables of the `run_*` functions.
+    With a `staging_dir`, sources are written there first so formatters can
+    rewrite them; `publish()` then moves the formatted files whose content
+    changed into `output_dir` and discards the rest.
+    """
+
+    def __init__(self, output_dir: str, staging_dir: Optional[str] = None):
+        self.output_dir = output_dir
+        self.staging_dir = staging_dir
+        self.staged: List[str] = []
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+
+        if staging_dir:
+            # Drop the leftovers of an interrupted run
+            delete_directory(staging_dir)
+
+    def __call__(self, module_path: str, source: str) -> None:
+        """
+        Write a generated source file.
+
+        Args:
+            module_path: File name, relative to the package directory
+            source: Content of the file
+        """
+        if self.staging_dir:
+            os.makedirs(self.staging_dir, exist_ok=True)
+            with open(os.path.join(self.staging_dir, module_path), "wb") as fp:
+                fp.write(source.encode("utf-8"))
+            self.staged.append(module_path)
+        elif write_source_file(self.output_dir, module_path, source):
+            self.written.append(module_path)
+        else:
+            self.unchanged.append(module_path)
+
+    def publish(self) -> None:
+        """Move the changed staged files into place and drop the staging."""
+        if not self.staging_dir:
+            return
+
+        for module_path in self.staged:
+            if replace_changed_file(
+                os.path.join(self.staging_dir, module_path),
+                os.path.join(self.output_dir, module_path),
+            ):
+                self.written.append(module_path)
+            else:
+                self.unchanged.append(module_path)
+
+        self.staged = []
+        delete_directory(self.staging_dir)
+
+    def log_stats(self) -> None:
+        """Log the number of written and unchanged files."""
+        logger.info(
+            "Wrote %d file(s), %d unchanged",
+            len(self.written),
+            len(self.unchanged),
+        )
+
+
+def render_module(
+    spec_name: str,
+    models: List[Model],
+    shared_names: Optional[List[str]] = None,
+    emit_models: Optional[Callable[[List[Model], TextIO], None]] = None,
+) -> str:
+    """
+    Render the Python module of a specification's models.
+
+    Args:
+        spec_name: Name of the specification, or `COMMON_MODULE`
+        models: List of model definitions
+        shared_names: Names of the models to import and re-export from the
+            shared module
+        emit_models: Function writing the models' code to the file, or None
+            to render the model template
+
+    Returns:
+        Source code of the module
+    """
+    # Merge the symbols each model recorded into one import per module
+    symbols = {"__future__": {"annotations"}}
+    for model in models:
+        for module, name in model.imports:
+            symbols.setdefault(module, set()).add(name)
+    imports = [
+        f"from {module} import {', '.join(sorted(names))}"
+        for module, names in sorted(symbols.items())
+    ]
+
+    # Generate module docstring
+    if spec_name == COMMON_MODULE:
+        docstring = (
+            "# pylint: disable=line-too-long\n"
+            '"""\nIconik Shared Models\n\n'
+            "This module contains the Pydantic models that several Iconik "
+            'APIs define identically.\n"""'
+        )
+    else:
+        docstring = (
+            "# pylint: disable=line-too-long\n"
+            f'"""\nIconik {spec_name.capitalize()} Models\n\n'
+            f"This module contains Pydantic models for the Iconik "
+            f'{spec_name.capitalize()} API.\n"""'
+        )
+
+    fp = io.StringIO()
+    fp.write(docstring + "\n\n")
+    fp.write("\n".join(imports) + "\n")
+    if shared_names:
+        # Keep the re-exports even where this module does not use them
+        fp.write(f"\nfrom .{COMMON_MODULE} import (  # nopycln: import\n")
+        for name in shared_names:
+            fp.write(f"    {name},\n")
+        fp.write(")\n")
+    fp.write("\n\n")
+
+    # Write the model code with string literals for cross-references
+    (emit_models or render_model_code)(models, fp)
+
+    # Add model_rebuild calls to resolve the forward references of cycles
+    cyclic = [
+        model.name for model in models if model.type_alias is None
+        and any(ref.forward for ref in model.iter_refs())
+    ]
+    if cyclic:
+        fp.write("\n\n# Update forward references\n")
+        for name in cyclic:
+            fp.write(f"{name}.model_rebuild()\n")
+
+    return fp.getvalue()
+
+
+def create_module_file(
+    spec_name: str,
+    models: List[Model],
+    output_dir: str,
+    shared_names: Optional[List[str]] = None,
+    emit_models: Optional[Callable[[List[Model], TextIO], None]] = None,
+) -> None:
+    """
+    Create a Python module file for a specification's models.
+
+    Args:
+        spec_name: Name of the specification, or `COMMON_MODULE`
+        models: List of model definitions
+        output_dir: Directory to save the module file
+        shared_names: Names of the models to import and re-export from the
+            shared module
+        emit_models: Function writing the models' code to the file, or None
+            to render the model template
+    """
+    write_source_file(
+        output_dir,
+        get_module_path(spec_name),
+        render_module(spec_name, models, shared_names, emit_models),
+    )
+
+
+def get_calendar_version(patch=None, modifier=None, modifier_num=None):
+    """
+    Generate a calendar-based version string in the format
+    YYYY.M[.P][-modifier.N]
+
+    Args:
+        patch: Optional patch number
+        modifier: Optional pre-release identifier (alpha/beta/rc)
+        modifier_num: Optional pre-release sequence number
+
+    Returns:
+        str: Calendar-based version string
+    """
+    now = datetime.now()
+    year = now.year
+    month = now.month
+
+    # Start with YYYY.M
+    version = f"{year}.{month}"
+
+    # Add patch if provided
+    if patch is not None:
+        version += f".{patch}"
+
+    # Add modifier and number if provided
+    if modifier is not None and modifier_num is not None:
+        version += f"-{modifier}.{modifier_num}"
+
+    return version
+
+
+def render_package_init(
+    spec_names: List[str], specs: Dict[str, Dict[str, Any]]
+) -> str:
+    """
+    Render the __init__.py of the models package.
+
+    Args:
+        spec_names: List of specification names
+        specs: Dictionary containing the full specifications with version info
+
+    Returns:
+        Source code of the package's __init__.py
+    """
+    # Create __init__.py with imports and version info
+    fp = io.StringIO()
+    fp.write('"""Iconik API models package."""\n\n')
+
+    # Import all modules
+    for spec_name in spec_names:
+        module_name = spec_name.replace("-", "_")
+        fp.write(f"from . import {module_name}\n")
+
+    # Package version using calendar versioning
+    version = get_calendar_version()
+    fp.write("# Package version (YYYY.M format)\n")
+    fp.write(f'__version__ = "{version}"\n\n')
+
+    # Document versioning scheme
+    fp.write('"""\n')
+    fp.write("This project uses calendar-based versioning in the format\n")
+    fp.write("`YYYY.M[.P][-modifier.N]` where:\n")
+    fp.write("\n")
+    fp.write("- `YYYY` - Four-digit year\n")
+    fp.write("- `M` - Month number (1-12)\n")
+    fp.write("- `P` - (Optional) Sequential patch number\n")
+    fp.write(
+        "- `modifier` - (Optional) Pre-release identifier (alpha/beta/rc)\n"
+    )
+    fp.write("- `N` - (Optional) Pre-release sequence number\n")
+    fp.write("\n")
+    fp.write("Examples:\n")
+    fp.write("\n")
+    fp.write("2025.5          -> May 2025 release\n")
+    fp.write("2025.5.1        -> May 2025 patch 1\n")
+    fp.write("2025.5-alpha.1  -> First alpha release for May 2025\n")
+    fp.write("2025.5-beta.1   -> First beta release for May 2025\n")
+    fp.write("2025.5-rc.1     -> First release candidate for May 2025\n")
+    fp.write('"""\n\n')
+
+    # Add API information with detailed metadata
+    fp.write("# API specification information\n")
+    fp.write("__info__ = {\n")
+
+    for spec_name in spec_names:
+        module_name = spec_name.replace("-", "_")
+
+        # Extract info from spec
+        version = "unknown"
+        openapi_version = "unknown"
+        title = f"Iconik {spec_name.capitalize()}"
+
+        if spec_name in specs and "info" in specs[spec_name]:
+            spec_info = specs[spec_name]["info"]
+            if "version" in spec_info:
+                version = spec_info["version"]
+            if "title" in spec_info:
+                title = spec_info["title"]
+
+        # Get OpenAPI version
+        if spec_name in specs and "openapi" in specs[spec_name]:
+            openapi_version = specs[spec_name]["openapi"]
+
+        fp.write(f'    "{module_name}": {{\n')
+        fp.write(f'        "version": "{version}",\n')
+        fp.write(f'        "openapi": "{openapi_version}",\n')
+        fp.write(f'        "title": "{title}"\n')
+        fp.write("    },\n")
+
+    fp.write("}\n\n")
+
+    fp.write("\n__all__ = [\n")
+    fp.write('    "__version__",\n')
+    fp.write('    "__info__",\n')
+
+    for spec_name in spec_names:
+        module_name = spec_name.replace("-", "_")
+        fp.write(f'    "{module_name}",\n')
+
+    fp.write("]\n")
+
+    return fp.getvalue()
+
+
+def create_package_files(
+    output_dir: str, spec_names: List[str], specs: Dict[str, Dict[str, Any]]
+) -> None:
+    """
+    Create package files (__init__.py) for the models package.
+
+    Args:
+        output_dir: Directory for the models package
+        spec_names: List of specification names
+        specs: Dictionary containing the full specifications with version info
+    """
+    write_source_file(
+        output_dir, "__init__.py", render_package_init(spec_names, specs)
+    )
+
+
+def format_generated_code(output_dir: str, format_code: bool = False) -> None:
+    """
+    Format the generated Python code using common linting tools.
+
+    Args:
+        output_dir: Directory containing the generated code
+        format_code: Whether to format the code
+    """
+    if not format_code:
+        logger.info("Skipping code formatting. Use --format-code to enable.")
+        return
+
+    formatters = [
+        {
+            "name": "pycln",
             "cmd": ["pycln", "--all", output_dir],
             "check": lambda: shutil.which("pycln") is not None,
         },
@@ -1121,81 +3029,745 @@ def format_generated_code(output_dir: str, format_code: bool = False) -> None:
         },
     ]
 
-    for formatter in formatters:
-        if formatter["check"]():
-            # Skip if command is None (which can happen for the sed command on
-            # Windows)
-            if formatter["cmd"] is None:
-                logger.warning(
-                    "Skipping %s as it's not properly supported on this OS",
-                    formatter["name"],
-                )
-                continue
+    for formatter in formatters:
+        if formatter["check"]():
+            # Skip if command is None (which can happen for the sed command on
+            # Windows)
+            if formatter["cmd"] is None:
+                logger.warning(
+                    "Skipping %s as it's not properly supported on this OS",
+                    formatter["name"],
+                )
+                continue
+
+            logger.info("Running %s...", formatter["name"])
+            try:
+                result = subprocess.run(
+                    formatter["cmd"],
+                    check=True,
+                    capture_output=True,
+                    text=True
+                )
+                logger.info("%s completed successfully", formatter["name"])
+                if result.stdout:
+                    logger.debug(
+                        "%s output: %s", formatter["name"], result.stdout
+                    )
+            except subprocess.CalledProcessError as e:
+                logger.error(
+                    "%s failed with code %d: %s",
+                    formatter["name"],
+                    e.returncode,
+                    e.stderr,
+                )
+        else:
+            logger.warning("%s not found. Skipping.", formatter["name"])
+
+
+def get_empty_line_removal_command(output_dir: str) -> Optional[List[str]]:
+    """
+    Generate the appropriate command to remove empty lines based on OS.
+
+    Args:
+        output_dir: Directory containing Python files to process
+
+    Returns:
+        A command list for subprocess or None if not supported
+    """
+    system = platform.system()
+
+    if system == "Windows":
+        # sed on Windows works differently and is often not reliable
+        # Alternative could be to use Python to process files directly
+        return None
+
+    python_files = glob.glob(
+        os.path.join(output_dir, "**/*.py"), recursive=True
+    )
+    cmds = (["sed", "-i", "", "-e", "s/[[:space:]]*$//", "-e", "/^$/d"]
+            if system == "Darwin" else
+            ["sed", "-i", "-e", "s/[[:space:]]*$//", "-e", "/^$/d"])
+    return cmds + python_files
+
+
+def delete_directory(path):
+    """
+    Recursively deletes a directory and its contents.
+
+    Args:
+        path: The path to the directory to delete.
+    """
+    try:
+        shutil.rmtree(path)
+        logger.debug("Successfully deleted directory: %s", path)
+    except FileNotFoundError:
+        logger.debug("Directory not found: %s", path)
+    except OSError as e:
+        logger.debug("Error deleting directory %s: %s", path, e)
+
+
+def file_sha256(path: str) -> Optional[str]:
+    """
+    Compute the SHA-256 digest of a file.
+
+    Args:
+        path: Path of the file
+
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    try:
+        with open(path, "rb") as fp:
+            return hashlib.sha256(fp.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def spec_file_sha256(spec_dir: str, spec_name: str) -> Optional[str]:
+    """
+    Compute the SHA-256 digest of a saved specification's raw content.
+
+    Compressed and uncompressed copies of a specification share a digest,
+    which is also the key of its blob in the snapshot store.
+
+    Args:
+        spec_dir: Directory containing `<spec_name>.json` or
+            `<spec_name>.json.gz` files
+        spec_name: Name of the specification
+
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    try:
+        return hashlib.sha256(read_spec_file(spec_dir, spec_name)).hexdigest()
+    except (OSError, EOFError):
+        return None
+
+
+def load_manifest(output_dir: str) -> Dict[str, Any]:
+    """
+    Load the checkpoint manifest of an earlier run.
+
+    Manifests written by another generator version are ignored.
+
+    Args:
+        output_dir: Directory of the models package
+
+    Returns:
+        Manifest with `specs` and `modules` entries (empty if unavailable)
+    """
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    empty = {"generator": __version__, "specs": {}, "modules": {}}
+
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as fp:
+            manifest = json.load(fp)
+    except FileNotFoundError:
+        return empty
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable manifest %s: %s", manifest_path, e)
+        return empty
+
+    if manifest.get("generator") != __version__:
+        logger.info("Ignoring manifest written by another generator version")
+        return empty
+
+    return manifest
+
+
+def save_manifest(output_dir: str, manifest: Dict[str, Any]) -> None:
+    """
+    Atomically write the checkpoint manifest.
+
+    Args:
+        output_dir: Directory of the models package
+        manifest: Manifest to write
+    """
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    temp_path = f"{manifest_path}.tmp"
+
+    with open(temp_path, "w", encoding="utf-8") as fp:
+        json.dump(manifest, fp, indent=2, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+
+@functools.lru_cache(maxsize=None)
+def get_generator_digest() -> str:
+    """
+    Hash the generator version and source, which shape every module.
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256(__version__.encode())
+    digest.update((file_sha256(__file__) or "").encode())
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """
+    Inputs the modules of an earlier run were generated from.
+
+    A module's key digests the generator, the type mapping, whether the code
+    is formatted and the module's own inputs: its specification's component
+    schemas and the names it imports from the shared module. A module is
+    current if its key matches the key the earlier run recorded in the
+    manifest and its file still has the recorded content; its generation,
+    rendering and formatting are then skipped. `names` holds the models
+    each module defines where later modules import them, so a skipped
+    shared module still tells its importers what it provides.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        modules: Dict[str, Dict[str, Any]],
+        type_mapping: Optional[TypeMapping] = None,
+        format_code: bool = False,
+    ):
+        self.output_dir = output_dir
+        self.modules = modules
+        self.salt = (
+            f"{get_generator_digest()}:"
+            f"{(type_mapping or DEFAULT_TYPE_MAPPING).digest()}:"
+            f"{format_code}"
+        ).encode()
+        self.keys: Dict[str, str] = {}
+        self.names: Dict[str, List[str]] = {}
+        self.skipped: List[str] = []
+
+    def is_current(self, name: str, *inputs: Any) -> bool:
+        """
+        Record a module's key and check whether its file is up to date.
+
+        Args:
+            name: Name of the specification, `COMMON_MODULE` or `__init__`
+            *inputs: JSON-serializable inputs of the module
+
+        Returns:
+            True if the module need not be generated again
+        """
+        digest = hashlib.sha256(self.salt)
+        for value in inputs:
+            digest.update(schema_digest(value))
+        key = self.keys[name] = digest.hexdigest()
+
+        entry = self.modules.get(name, {})
+        if entry.get("inputs") != key or file_sha256(
+            os.path.join(self.output_dir, entry["path"])
+        ) != entry["sha256"]:
+            return False
+
+        self.skipped.append(name)
+        return True
+
+    def log_stats(self) -> None:
+        """Log the number of up-to-date modules."""
+        logger.info(
+            "Build cache: %d of %d module(s) up to date",
+            len(self.skipped),
+            len(self.keys),
+        )
+
+
+def plan_resume(
+    manifest: Dict[str, Any], output_dir: str, spec_dir: Optional[str]
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Decide which parts of an earlier run can be reused.
+
+    Args:
+        manifest: Checkpoint manifest of the earlier run
+        output_dir: Directory of the models package
+        spec_dir: Directory holding the specifications saved by the earlier
+            run, or None if they should not be reused
+
+    Returns:
+        Tuple of (done, reuse, fetch) specification names, where done specs
+            have an intact module, reuse specs have an intact saved
+            specification but no module, and fetch specs must be fetched again
+    """
+    done, reuse, fetch = [], [], []
+
+    for spec_name in SPEC_NAMES:
+        spec_entry = manifest["specs"].get(spec_name, {})
+        module_entry = manifest["modules"].get(spec_name, {})
+        module_path = os.path.join(output_dir, module_entry.get("path", ""))
+
+        if spec_entry.get("status") != "fetched":
+            fetch.append(spec_name)
+        elif module_entry and (
+            file_sha256(module_path) == module_entry["sha256"]
+        ):
+            done.append(spec_name)
+        elif spec_dir and (
+            spec_file_sha256(spec_dir, spec_name) == spec_entry["sha256"]
+        ):
+            reuse.append(spec_name)
+        else:
+            fetch.append(spec_name)
+
+    return done, reuse, fetch
+
+
+def checkpoint_specs(
+    spec_iter: Iterator[Tuple[str, Dict[str, Any]]],
+    manifest: Dict[str, Any],
+    output_dir: str,
+    spec_digest: Callable[[str], Optional[str]],
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Record each specification in the manifest as it passes through.
+
+    Args:
+        spec_iter: Iterator of (spec_name, parsed JSON content) tuples
+        manifest: Checkpoint manifest, updated in place and saved after each
+            specification
+        output_dir: Directory of the models package
+        spec_digest: Function returning the SHA-256 of a specification's raw
+            content by name
+
+    Yields:
+        The tuples of `spec_iter`, unchanged
+    """
+    for spec_name, spec in spec_iter:
+        manifest["specs"][spec_name] = {
+            "status": "fetched",
+            "sha256": spec_digest(spec_name),
+            "headers": {
+                key: spec[key]
+                for key in ("info", "openapi")
+                if key in spec
+            },
+        }
+        save_manifest(output_dir, manifest)
+
+        yield spec_name, spec
+        del spec
+
+
+def render_spec_module(
+    spec_name: str,
+    spec_schemas: Dict[str, Any],
+    imported: FrozenSet[str],
+    shared_names: List[str],
+    *,
+    type_mapping: Optional[TypeMapping] = None,
+    emit_models: Optional[Callable[[List[Model], TextIO], None]] = None,
+) -> Optional[str]:
+    """
+    Generate and render one specification's module.
+
+    Args:
+        spec_name: Name of the specification
+        spec_schemas: The specification's component schemas, which its
+            references resolve against
+        imported: Names of the schemas emitted in the shared module
+        shared_names: Names of the models to re-export from the shared module
+        type_mapping: Registry of Python types, or None for the defaults
+        emit_models: Function writing a module's model code, or None to
+            render the model template
 
-            logger.info("Running %s...", formatter["name"])
-            try:
-                result = subprocess.run(
-                    formatter["cmd"],
-                    check=True,
-                    capture_output=True,
-                    text=True
-                )
-                logger.info("%s completed successfully", formatter["name"])
-                if result.stdout:
-                    logger.debug(
-                        "%s output: %s", formatter["name"], result.stdout
-                    )
-            except subprocess.CalledProcessError as e:
-                logger.error(
-                    "%s failed with code %d: %s",
-                    formatter["name"],
-                    e.returncode,
-                    e.stderr,
-                )
+    Returns:
+        Source code of the module, or None if it has neither models nor
+            re-exports
+    """
+    models = generate_spec_models(
+        spec_schemas, imported, type_mapping=type_mapping
+    )
+    if not models and not shared_names:
+        return None
+    return render_module(spec_name, models, shared_names, emit_models)
+
+
+# Read-only state of a generation worker process, set by init_worker
+WORKER_STATE: Dict[str, Any] = {}
+
+
+def init_worker(
+    schemas: Dict[str, Dict[str, Any]],
+    type_mapping: Optional[TypeMapping],
+    emit_models: Optional[Callable[[List[Model], TextIO], None]],
+) -> None:
+    """
+    Store the schema index and options shared by a pool's tasks.
+
+    Args:
+        schemas: Dictionary mapping specification names to their component
+            schemas
+        type_mapping: Registry of Python types, or None for the defaults
+        emit_models: Function writing a module's model code, or None to
+            render the model template
+    """
+    WORKER_STATE.update(
+        schemas=schemas, type_mapping=type_mapping, emit_models=emit_models
+    )
+
+
+def render_worker_module(
+    task: Tuple[str, FrozenSet[str], List[str]],
+) -> Optional[str]:
+    """
+    Generate and render a specification's module in a worker process.
+
+    Args:
+        task: Tuple of (spec_name, imported, shared_names) as taken by
+            `render_spec_module`
+
+    Returns:
+        Source code of the module, or None if it has neither models nor
+            re-exports
+    """
+    spec_name, imported, shared_names = task
+    return render_spec_module(
+        spec_name,
+        WORKER_STATE["schemas"][spec_name],
+        imported,
+        shared_names,
+        type_mapping=WORKER_STATE["type_mapping"],
+        emit_models=WORKER_STATE["emit_models"],
+    )
+
+
+def iter_module_sources(
+    schemas: Dict[str, Dict[str, Any]],
+    shared: Dict[str, List[str]],
+    shared_names_by_spec: Dict[str, List[str]],
+    *,
+    type_mapping: Optional[TypeMapping] = None,
+    emit_models: Optional[Callable[[List[Model], TextIO], None]] = None,
+    jobs: int = 1,
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Generate and render the modules of several specifications.
+
+    With more than one job, the specifications are fanned out to a process
+    pool. Each worker receives the schema index once when it starts, which
+    the fork start method shares without copying, and the sources arrive
+    in the order of `schemas`, so the output is identical to a serial run.
+
+    Args:
+        schemas: Dictionary mapping specification names to their component
+            schemas
+        shared: Schemas emitted in the shared module, as returned by
+            `find_shared_schemas`
+        shared_names_by_spec: Dictionary mapping specification names to the
+            names of the models they re-export from the shared module
+        type_mapping: Registry of Python types, or None for the defaults
+        emit_models: Function writing a module's model code, or None to
+            render the model template
+        jobs: Number of worker processes
+
+    Yields:
+        Tuples of (spec_name, source), where source is None if the module
+            has neither models nor re-exports
+    """
+    tasks = []
+    for spec_name in schemas:
+        imported = frozenset(
+            schema_name for schema_name, spec_names in shared.items()
+            if spec_name in spec_names
+        )
+        tasks.append((spec_name, imported, shared_names_by_spec[spec_name]))
+
+    if jobs <= 1 or len(tasks) < 2:
+        for spec_name, imported, shared_names in tasks:
+            yield spec_name, render_spec_module(
+                spec_name,
+                schemas[spec_name],
+                imported,
+                shared_names,
+                type_mapping=type_mapping,
+                emit_models=emit_models,
+            )
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(tasks)),
+        initializer=init_worker,
+        initargs=(schemas, type_mapping, emit_models),
+    ) as executor:
+        yield from zip(
+            (task[0] for task in tasks),
+            executor.map(render_worker_module, tasks),
+        )
+
+
+def run_sequential(
+    spec_iter: Iterator[Tuple[str, Dict[str, Any]]],
+    write_source: Callable[[str, str], None],
+    *,
+    shared_models: bool = False,
+    type_mapping: Optional[TypeMapping] = None,
+    emit_models: Optional[Callable[[List[Model], TextIO], None]] = None,
+    build_cache: Optional[BuildCache] = None,
+    jobs: int = 1,
+) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+    """
+    Load every specification, then generate and write all modules.
+
+    With `shared_models`, schemas that several specifications define
+    identically are written once to the `COMMON_MODULE` module and
+    re-exported from each specification's module.
+
+    Args:
+        spec_iter: Iterator of (spec_name, parsed JSON content) tuples
+        write_source: Function taking the path and source of each module
+        shared_models: Whether to deduplicate identical schemas
+        type_mapping: Registry of Python types, or None for the defaults
+        emit_models: Function writing a module's model code, or None to
+            render the model template
+        build_cache: Inputs of an earlier run's modules, to skip the
+            modules that are up to date, or None to generate every module
+        jobs: Number of processes generating and rendering the modules
+
+    Returns:
+        Tuple of (specs, generated) where specs maps specification names to
+            their parsed JSON content in `SPEC_NAMES` order and generated is
+            the set of specification names that produced or kept a module,
+            plus `COMMON_MODULE` if the shared module was written or kept
+    """
+    specs = order_specs(dict(spec_iter))
+    generated = set()
+
+    # Extract schemas for each spec
+    schemas = extract_schemas(specs)
+
+    # Write the identically defined schemas once to the shared module
+    shared = find_shared_schemas(schemas) if shared_models else {}
+    common_names = set()
+    if shared:
+        common_schemas = {
+            schema_name: schemas[spec_names[0]][schema_name]
+            for schema_name, spec_names in shared.items()
+        }
+        if build_cache and build_cache.is_current(
+            COMMON_MODULE, common_schemas
+        ):
+            # Shared schemas that are not objects define no model there
+            generated.add(COMMON_MODULE)
+            common_names = set(
+                build_cache.modules[COMMON_MODULE].get("names", ())
+            )
         else:
-            logger.warning("%s not found. Skipping.", formatter["name"])
+            common_models = generate_spec_models(
+                common_schemas, type_mapping=type_mapping
+            )
+            if common_models:
+                write_source(
+                    get_module_path(COMMON_MODULE),
+                    render_module(
+                        COMMON_MODULE, common_models, emit_models=emit_models
+                    ),
+                )
+                generated.add(COMMON_MODULE)
+                common_names = {model.name for model in common_models}
+        if build_cache:
+            build_cache.names[COMMON_MODULE] = sorted(common_names)
+
+        logger.info(
+            "Shared %d model(s) in %s.py instead of %d copies",
+            len(common_names),
+            COMMON_MODULE,
+            sum(len(shared[schema_name]) for schema_name in common_names),
+        )
+
+    shared_names_by_spec = {
+        spec_name: sorted(
+            schema_name
+            for schema_name in common_names
+            if spec_name in shared[schema_name]
+        )
+        for spec_name in schemas
+    }
 
+    # Generate the modules of the specifications whose inputs changed;
+    # references resolve within the specification's own namespace
+    stale = {
+        spec_name: spec_schemas
+        for spec_name, spec_schemas in schemas.items()
+        if not build_cache or not build_cache.
+        is_current(spec_name, spec_schemas, shared_names_by_spec[spec_name])
+    }
+    generated.update(schemas.keys() - stale.keys())
 
-def get_empty_line_removal_command(output_dir: str) -> Optional[List[str]]:
+    # Create module files
+    for spec_name, source in iter_module_sources(
+        stale,
+        shared,
+        shared_names_by_spec,
+        type_mapping=type_mapping,
+        emit_models=emit_models,
+        jobs=jobs,
+    ):
+        if source is not None:
+            write_source(get_module_path(spec_name), source)
+            generated.add(spec_name)
+
+    return specs, generated
+
+
+def run_pipeline(
+    spec_iter: Iterator[Tuple[str, Dict[str, Any]]],
+    write_source: Callable[[str, str], None],
+    type_mapping: Optional[TypeMapping] = None,
+    emit_models: Optional[Callable[[List[Model], TextIO], None]] = None,
+    build_cache: Optional[BuildCache] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
     """
-    Generate the appropriate command to remove empty lines based on OS.
+    Generate and write each specification's module as soon as it arrives.
+
+    The references of each specification resolve within its own schemas, so
+    the generated modules are identical to the sequential path regardless of
+    the order in which the specifications arrive.
 
     Args:
-        output_dir: Directory containing Python files to process
+        spec_iter: Iterator of (spec_name, parsed JSON content) tuples
+        write_source: Function taking the path and source of each module
+        type_mapping: Registry of Python types, or None for the defaults
+        emit_models: Function writing a module's model code, or None to
+            render the model template
+        build_cache: Inputs of an earlier run's modules, to skip the
+            modules that are up to date, or None to generate every module
 
     Returns:
-        A command list for subprocess or None if not supported
+        Tuple of (specs, generated) where specs maps specification names to
+            their parsed JSON content in `SPEC_NAMES` order and generated is
+            the set of specification names that produced a module
     """
-    system = platform.system()
+    specs = {}
+    generated = set()
 
-    if system == "Windows":
-        # sed on Windows works differently and is often not reliable
-        # Alternative could be to use Python to process files directly
-        return None
+    for spec_name, spec in spec_iter:
+        specs[spec_name] = spec
 
-    python_files = glob.glob(
-        os.path.join(output_dir, "**/*.py"), recursive=True
-    )
-    cmds = (["sed", "-i", "", "-e", "s/[[:space:]]*$//", "-e", "/^$/d"]
-            if system == "Darwin" else
-            ["sed", "-i", "-e", "s/[[:space:]]*$//", "-e", "/^$/d"])
-    return cmds + python_files
+        spec_schemas = extract_schemas({spec_name: spec})[spec_name]
+        if build_cache and build_cache.is_current(spec_name, spec_schemas, []):
+            generated.add(spec_name)
+            continue
 
+        models = generate_spec_models(spec_schemas, type_mapping=type_mapping)
 
-def delete_directory(path):
+        if models:
+            write_source(
+                get_module_path(spec_name),
+                render_module(spec_name, models, emit_models=emit_models),
+            )
+            generated.add(spec_name)
+
+    return order_specs(specs), generated
+
+
+def run_low_memory(
+    spec_iter: Iterator[Tuple[str, Dict[str, Any]]],
+    write_source: Callable[[str, str], None],
+    type_mapping: Optional[TypeMapping] = None,
+    emit_models: Optional[Callable[[List[Model], TextIO], None]] = None,
+    build_cache: Optional[BuildCache] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
     """
-    Recursively deletes a directory and its contents.
+    Generate and write one specification at a time with bounded memory.
+
+    Only each specification's `info` and `openapi` headers outlive a loop
+    iteration; the full specification tree and its model definitions are
+    released as soon as the module is written. A specification's `$ref`s
+    point into its own document, so its own component schemas are all that
+    generation needs.
 
     Args:
-        path: The path to the directory to delete.
+        spec_iter: Iterator of (spec_name, parsed JSON content) tuples
+        write_source: Function taking the path and source of each module
+        type_mapping: Registry of Python types, or None for the defaults
+        emit_models: Function writing a module's model code, or None to
+            render the model template
+        build_cache: Inputs of an earlier run's modules, to skip the
+            modules that are up to date, or None to generate every module
+
+    Returns:
+        Tuple of (specs, generated) where specs maps specification names to
+            their `info` and `openapi` headers in `SPEC_NAMES` order and
+            generated is the set of specification names that produced a module
     """
-    try:
-        shutil.rmtree(path)
-        logger.debug("Successfully deleted directory: %s", path)
-    except FileNotFoundError:
-        logger.debug("Directory not found: %s", path)
-    except OSError as e:
-        logger.debug("Error deleting directory %s: %s", path, e)
+    headers: Dict[str, Dict[str, Any]] = {}
+    generated = set()
+
+    for spec_name, spec in spec_iter:
+        headers[spec_name] = {
+            key: spec[key]
+            for key in ("info", "openapi")
+            if key in spec
+        }
+
+        spec_schemas = extract_schemas({spec_name: spec})[spec_name]
+
+        if build_cache and build_cache.is_current(spec_name, spec_schemas, []):
+            generated.add(spec_name)
+            models = None
+        else:
+            models = generate_spec_models(
+                spec_schemas, type_mapping=type_mapping
+            )
+        if models:
+            write_source(
+                get_module_path(spec_name),
+                render_module(spec_name, models, emit_models=emit_models),
+            )
+            generated.add(spec_name)
+
+        # Release the specification tree before loading the next one
+        del spec, spec_schemas, models
+
+        if tracemalloc.is_tracing():
+            logger.info(
+                "Traced memory after %s: %.1f MiB",
+                spec_name,
+                tracemalloc.get_traced_memory()[0] / 1048576,
+            )
+
+    return order_specs(headers), generated
+
+
+def generate(
+    specs: Dict[str, Dict[str, Any]],
+    shared_models: bool = False,
+    type_mapping: Optional[TypeMapping] = None,
+    emit_models: Optional[Callable[[List[Model], TextIO], None]] = None,
+    jobs: int = 1,
+) -> Dict[str, str]:
+    """
+    Generate the models package in memory.
+
+    This runs the same generation as `main()` without touching the disk, so
+    callers can compare the sources with an existing package before writing
+    them. The sources are not formatted.
+
+    Args:
+        specs: Dictionary mapping specification names to their parsed JSON
+            content, in any order
+        shared_models: Whether to deduplicate identical schemas
+        type_mapping: Registry of Python types, or None for the defaults
+        emit_models: Function writing a module's model code, or None to
+            render the model template
+        jobs: Number of processes generating and rendering the modules
+
+    Returns:
+        Dict mapping module paths, relative to the package directory, to
+            their source code in path order
+    """
+    sources: Dict[str, str] = {}
+    specs, generated = run_sequential(
+        iter(specs.items()),
+        sources.__setitem__,
+        shared_models=shared_models,
+        type_mapping=type_mapping,
+        emit_models=emit_models,
+        jobs=jobs,
+    )
+    sources["__init__.py"] = render_package_init([
+        spec_name for spec_name in specs if spec_name in generated
+    ], specs)
+
+    return {path: sources[path] for path in sorted(sources)}
 
 
 # Update main function to include the formatting option
@@ -1219,17 +3791,170 @@ def main():
         action="store_true",
         help="Format generated code using pycln, isort, and yapf",
     )
+    parser.add_argument(
+        "-w",
+        "--download-workers",
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help=(
+            "Number of concurrent specification downloads "
+            f"(default: {DOWNLOAD_WORKERS})"
+        ),
+    )
+    parser.add_argument(
+        "--base-url",
+        default=BASE_URL,
+        help=f"URL template for the specifications (default: {BASE_URL})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=(
+            "Directory for the conditional-GET specification cache "
+            "(default: OUTPUT_DIR/_cache)"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download specifications without the cache",
+    )
+    parser.add_argument(
+        "--no-parsed-cache",
+        action="store_true",
+        help=(
+            "Always parse the specification JSON instead of loading parsed "
+            "specifications from CACHE_DIR/parsed"
+        ),
+    )
+    parser.add_argument(
+        "--spec-dir",
+        help="Load specifications from this directory instead of downloading",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help=(
+            "Never touch the network; load specifications from --spec-dir or "
+            "the specification cache"
+        ),
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--pipeline",
+        action="store_true",
+        help=(
+            "Generate and write each module as soon as its specification "
+            "arrives"
+        ),
+    )
+    mode.add_argument(
+        "--low-memory",
+        action="store_true",
+        help=(
+            "Process one specification at a time and release it once its "
+            "module is written"
+        ),
+    )
+    mode.add_argument(
+        "--shared-models",
+        action="store_true",
+        help=(
+            f"Write models that several specifications define identically "
+            f"once to {COMMON_MODULE}.py and re-export them"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "Number of processes generating and rendering the modules "
+            "(default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--type-map",
+        metavar="FILE",
+        help=(
+            "JSON file overriding the Python types of OpenAPI types and "
+            'formats, e.g. {"string:uri": "str"}'
+        ),
+    )
+    parser.add_argument(
+        "--emitter",
+        choices=sorted(EMITTERS),
+        default="jinja",
+        help=(
+            "Write model code by rendering the Jinja template or by direct "
+            "string building (default: jinja)"
+        ),
+    )
+    parser.add_argument(
+        "--snapshot-store",
+        help=(
+            "Directory of the content-addressed specification snapshot store "
+            "(default: OUTPUT_DIR/_snapshots)"
+        ),
+    )
+    parser.add_argument(
+        "--no-snapshots",
+        action="store_true",
+        help="Do not record downloaded specifications as a snapshot",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="SNAPSHOT_ID",
+        help="Generate offline from a stored snapshot (ID, prefix or latest)",
+    )
+    parser.add_argument(
+        "--list-snapshots",
+        action="store_true",
+        help="List the stored snapshots and exit",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Reuse the results of an earlier run and redo only failed or "
+            "missing specifications and modules"
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every module, even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--no-compress-specs",
+        action="store_true",
+        help="Save downloaded specifications as plain .json files",
+    )
     parser.add_argument(
         "--keep-downloads",
         action="store_true",
         help="Keep the downloaded spec files",
     )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Measure peak memory allocation with tracemalloc",
+    )
     parser.add_argument(
         "--debug", action="store_true", help="Enable debug logging"
     )
 
     args = parser.parse_args()
 
+    if args.shared_models and args.resume:
+        parser.error("--shared-models cannot be combined with --resume")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.jobs > 1 and (args.pipeline or args.low_memory):
+        parser.error(
+            "--jobs cannot be combined with --pipeline or --low-memory"
+        )
+
     if args.debug:
 
         logging.basicConfig(
@@ -1244,47 +3969,258 @@ def main():
 
     output_dir = args.output_dir
     spec_dir = os.path.join(output_dir, "_specs")
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or os.path.join(output_dir, "_cache")
+
+    parsed_cache_dir = None
+    if cache_dir and not args.no_parsed_cache:
+        parsed_cache_dir = os.path.join(cache_dir, "parsed")
+
+    snapshot_dir = None
+    if not args.no_snapshots:
+        snapshot_dir = args.snapshot_store or os.path.join(
+            output_dir, "_snapshots"
+        )
+
+    if args.list_snapshots or args.snapshot:
+        if not snapshot_dir:
+            logger.error("The snapshot store is disabled by --no-snapshots.")
+            return 1
+
+    if args.list_snapshots:
+        for snapshot in load_snapshot_index(snapshot_dir)["snapshots"]:
+            print(
+                f"{snapshot['id']}  {snapshot['created']}  "
+                f"{len(snapshot['specs'])} specification(s)"
+            )
+        return 0
+
+    snapshot = None
+    if args.snapshot:
+        snapshot = find_snapshot(snapshot_dir, args.snapshot)
+        if snapshot is None:
+            logger.error("No unique snapshot matches: %s", args.snapshot)
+            return 1
+
+    offline = bool(args.offline or args.spec_dir or snapshot)
+    source_dir = args.spec_dir or cache_dir
+    if offline and not snapshot and not source_dir:
+        logger.error("--offline needs --spec-dir when the cache is disabled.")
+        return 1
+
+    type_mapping = DEFAULT_TYPE_MAPPING
+    if args.type_map:
+        try:
+            type_mapping = TypeMapping.from_file(args.type_map)
+        except (OSError, ValueError) as e:
+            logger.error("Cannot load type mapping %s: %s", args.type_map, e)
+            return 1
+        logger.info(
+            "Loaded %d type mapping override(s) from %s",
+            len(type_mapping.overrides),
+            args.type_map,
+        )
+
+    emit_models = EMITTERS[args.emitter]
+    if args.emitter == "jinja" and cache_dir:
+        # Reuse the compiled template across runs
+        emit_models = functools.partial(
+            render_model_code,
+            bytecode_cache_dir=os.path.join(cache_dir, "templates"),
+        )
+
+    if args.trace_memory:
+        tracemalloc.start()
 
     # Create output directories
     os.makedirs(output_dir, exist_ok=True)
-    os.makedirs(spec_dir, exist_ok=True)
 
-    # Download specifications
-    specs = download_specs(spec_dir)
-
-    if not specs:
-        logger.error("No specifications downloaded. Exiting.")
-        return 1
+    previous = load_manifest(output_dir)
+    manifest = (
+        previous if args.resume else {
+            "generator": __version__,
+            "specs": {},
+            "modules": {}
+        }
+    )
 
-    # Extract all schemas for reference resolution
-    all_schemas = extract_all_schemas(specs)
+    # Skip the modules whose inputs match those recorded by the earlier run
+    build_cache = BuildCache(
+        output_dir,
+        {} if args.force else dict(previous["modules"]),
+        type_mapping,
+        args.format_code,
+    )
 
-    # Extract schemas for each spec
-    schemas = extract_schemas(specs)
+    # Modules generated with other type mapping overrides are out of date
+    if manifest.get("type_mapping", "") != type_mapping.digest():
+        if manifest["modules"]:
+            logger.info("Regenerating all modules for the new type mapping")
+        manifest["modules"] = {}
+    manifest["type_mapping"] = type_mapping.digest()
 
-    # Generate models
-    models_by_spec = generate_models(schemas, all_schemas)
+    # Skip intact modules and reuse saved specifications of an earlier run
+    done, reuse, fetch = plan_resume(
+        manifest, output_dir, None if offline else spec_dir
+    )
+    if args.resume:
+        logger.info(
+            "Resuming: %d module(s) intact, %d specification(s) to reuse, "
+            "%d to fetch",
+            len(done),
+            len(reuse),
+            len(fetch),
+        )
 
-    # Create module files
-    for spec_name, models in models_by_spec.items():
-        if models:
-            create_module_file(spec_name, models, output_dir)
+    if snapshot:
+        # Load a historical snapshot without touching the network
+        spec_iter = iter_snapshot_specs(
+            snapshot_dir, snapshot, args.trace_memory, fetch, parsed_cache_dir
+        )
+        spec_digest = snapshot["specs"].get
+    elif offline:
+        # Load specifications from disk without importing requests
+        spec_iter = iter_loaded_specs(
+            source_dir, args.trace_memory, fetch, parsed_cache_dir
+        )
+        spec_digest = functools.partial(spec_file_sha256, source_dir)
+    else:
+        # Download specifications
+        os.makedirs(spec_dir, exist_ok=True)
+        spec_iter = itertools.chain(
+            iter_loaded_specs(
+                spec_dir, args.trace_memory, reuse, parsed_cache_dir
+            ),
+            iter_downloaded_specs(
+                spec_dir,
+                args.download_workers,
+                args.base_url,
+                cache_dir=cache_dir,
+                trace_memory=args.trace_memory,
+                spec_names=fetch,
+                compress=not args.no_compress_specs,
+                parsed_cache_dir=parsed_cache_dir,
+            ),
+        )
+        spec_digest = functools.partial(spec_file_sha256, spec_dir)
 
-    # Create package files
-    create_package_files(
+    spec_iter = checkpoint_specs(spec_iter, manifest, output_dir, spec_digest)
+    # Format into a staging directory so unchanged files are never rewritten
+    write_source = SourceWriter(
         output_dir,
-        [name for name in SPEC_NAMES if models_by_spec.get(name)],
-        specs,
+        os.path.join(output_dir, STAGING_DIR) if args.format_code else None,
     )
 
-    # Format the generated code
-    format_generated_code(output_dir, args.format_code)
+    if args.pipeline:
+        # Generate and write each module while the rest are still loading
+        specs, generated = run_pipeline(
+            spec_iter, write_source, type_mapping, emit_models, build_cache
+        )
+    elif args.low_memory:
+        # Keep at most one specification tree alive at a time
+        specs, generated = run_low_memory(
+            spec_iter, write_source, type_mapping, emit_models, build_cache
+        )
+    else:
+        specs, generated = run_sequential(
+            spec_iter,
+            write_source,
+            shared_models=args.shared_models,
+            type_mapping=type_mapping,
+            emit_models=emit_models,
+            build_cache=build_cache,
+            jobs=args.jobs,
+        )
+
+    failed = [
+        spec_name for spec_name in SPEC_NAMES
+        if spec_name not in done and spec_name not in specs
+    ]
+    for spec_name in failed:
+        manifest["specs"][spec_name] = {"status": "failed"}
+        manifest["modules"].pop(spec_name, None)
+
+    # Drop the shared module of an earlier --shared-models run; modules kept
+    # by --resume may still import it
+    common_path = os.path.join(output_dir, f"{COMMON_MODULE}.py")
+    if COMMON_MODULE not in generated and not args.resume:
+        if os.path.exists(common_path):
+            os.remove(common_path)
+        manifest["modules"].pop(COMMON_MODULE, None)
+
+    if not specs and not done:
+        save_manifest(output_dir, manifest)
+        logger.error("No specifications loaded. Exiting.")
+        return 1
+
+    # Intact modules of an earlier run keep their recorded headers
+    specs = order_specs({
+        **{
+            spec_name: manifest["specs"][spec_name]["headers"]
+            for spec_name in done
+        },
+        **specs,
+    })
 
-    if not args.keep_downloads:
+    # Create package files
+    init_source = render_package_init(
+        [name for name in SPEC_NAMES if name in generated or name in done],
+        specs,
+    )
+    if not build_cache.is_current(INIT_MODULE, init_source):
+        write_source(get_module_path(INIT_MODULE), init_source)
+    generated.add(INIT_MODULE)
+
+    # Format the generated code, then replace only the files that changed
+    if write_source.staged or not write_source.staging_dir:
+        format_generated_code(
+            write_source.staging_dir or output_dir, args.format_code
+        )
+    write_source.publish()
+    write_source.log_stats()
+    build_cache.log_stats()
+
+    # Record the generated modules with the hashes of their final content,
+    # the inputs they were generated from and the names others import
+    for spec_name in generated:
+        module_path = get_module_path(spec_name)
+        manifest["modules"][spec_name] = {
+            "path": module_path,
+            "sha256": file_sha256(os.path.join(output_dir, module_path)),
+        }
+        if spec_name in build_cache.keys:
+            manifest["modules"][spec_name]["inputs"] = build_cache.keys[
+                spec_name]
+        if spec_name in build_cache.names:
+            manifest["modules"][spec_name]["names"] = build_cache.names[
+                spec_name]
+    save_manifest(output_dir, manifest)
+
+    # Record a snapshot only from a complete set of fetched specifications;
+    # a failed or resumed run may lack some of them or hold stale copies
+    if snapshot_dir and not offline and not failed and all(
+        spec_file_sha256(spec_dir, spec_name) == manifest["specs"][spec_name]
+        ["sha256"] for spec_name in SPEC_NAMES
+    ):
+        save_snapshot(snapshot_dir, spec_dir)
+
+    if failed:
+        logger.error(
+            "Failed to load %d specification(s): %s. Re-run with --resume to "
+            "retry only the missing pieces.",
+            len(failed),
+            ", ".join(failed),
+        )
+    elif not offline and not args.keep_downloads:
         delete_directory(f"{output_dir}/_specs")
 
+    if args.trace_memory:
+        logger.info("Peak traced memory: %.1f MiB", get_traced_peak() / 1048576)
+        tracemalloc.stop()
+
     logger.info("Model generation complete. Package created at: %s", output_dir)
-    return 0
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
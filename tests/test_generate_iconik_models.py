@@ -0,0 +1,1068 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the generate_iconik_models script.
+
+The specification fixtures in `examples/models/_specs` are served by a local
+HTTP stand-in so the download paths can be exercised without network access.
+"""
+import functools
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import tracemalloc
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.generate_iconik_models import (
+    SPEC_NAMES,
+    Field,
+    Model,
+    SourceWriter,
+    TypeLiteral,
+    TypeMapping,
+    TypeRef,
+    TypeUnion,
+    collect_model_dependencies,
+    create_module_file,
+    create_session,
+    download_spec,
+    download_specs,
+    emit_model_code,
+    extract_schemas,
+    find_model_components,
+    find_shared_schemas,
+    find_snapshot,
+    flatten_all_of,
+    generate,
+    generate_models,
+    generate_spec_models,
+    iter_loaded_specs,
+    load_specs,
+    main,
+    parse_spec,
+    read_parsed_spec,
+    read_spec_file,
+    render_model_code,
+    render_module,
+    resolve_schema_references,
+    run_low_memory,
+    run_pipeline,
+    run_sequential,
+    sort_models_by_dependency,
+    write_source_file,
+)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPECS_DIR = os.path.join(ROOT_DIR, "examples", "models", "_specs")
+
+
+class SpecServer(ThreadingHTTPServer):
+    """Local HTTP server recording the responses of its handlers."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), SpecRequestHandler)
+        self.fail_specs = frozenset()
+        self.status_codes = []
+
+
+class SpecRequestHandler(SimpleHTTPRequestHandler):
+    """Serve `/docs/<name>/spec/` from the specification fixtures."""
+
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, *args, **kwargs):
+        self.etag = None
+        super().__init__(*args, **kwargs)
+
+    def translate_path(self, path):
+        spec_name = path.strip("/").split("/")[1]
+        return os.path.join(SPECS_DIR, f"{spec_name}.json")
+
+    def send_head(self):
+        spec_name = self.path.strip("/").split("/")[1]
+        if spec_name in self.server.fail_specs:
+            self.send_error(503)
+            return None
+
+        with open(self.translate_path(self.path), "rb") as fp:
+            body = fp.read()
+        self.etag = f'"{hashlib.sha256(body).hexdigest()}"'
+
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return None
+
+        if "gzip" not in self.headers.get("Accept-Encoding", ""):
+            return super().send_head()
+
+        body = gzip.compress(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def end_headers(self):
+        if self.etag:
+            self.send_header("ETag", self.etag)
+        super().end_headers()
+
+    def log_request(self, code="-", size="-"):
+        self.server.status_codes.append(int(code))
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture(scope="module")
+def fixture_specs():
+    """Return the parsed specification fixtures."""
+    return load_specs(SPECS_DIR)
+
+
+@pytest.fixture
+def spec_server():
+    """Run a local HTTP server that serves the specification fixtures."""
+    server = SpecServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def base_url(spec_server):
+    """Return the URL template for the local specification server."""
+    host, port = spec_server.server_address
+    return f"http://{host}:{port}/docs/{{}}/spec/"
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_download_specs_order(tmp_path, base_url, workers):
+    """Test that downloads keep the SPEC_NAMES order for any worker count."""
+    specs = download_specs(str(tmp_path), workers=workers, base_url=base_url)
+
+    assert list(specs) == SPEC_NAMES
+    assert "components" in specs["files"]
+    for spec_name in SPEC_NAMES:
+        with open(os.path.join(SPECS_DIR, f"{spec_name}.json"), "rb") as fp:
+            assert read_spec_file(str(tmp_path), spec_name) == fp.read()
+        assert (tmp_path / f"{spec_name}.json.gz").exists()
+        assert not (tmp_path / f"{spec_name}.json").exists()
+
+
+def test_download_specs_failure(tmp_path, base_url, spec_server):
+    """Test that a failed download is skipped without affecting the rest."""
+    spec_server.fail_specs = frozenset({"jobs"})
+
+    specs = download_specs(str(tmp_path), workers=4, base_url=base_url)
+
+    assert "jobs" not in specs
+    assert list(specs) == [name for name in SPEC_NAMES if name != "jobs"]
+
+
+def test_download_spec_compressed(tmp_path, base_url):
+    """Test that gzip is negotiated and measured on the wire and on disk."""
+    with create_session() as session:
+        result = download_spec(session, "files", str(tmp_path), base_url)
+        plain = download_spec(
+            session, "files", str(tmp_path), base_url, compress=False
+        )
+
+    with open(os.path.join(SPECS_DIR, "files.json"), "rb") as fp:
+        content = fp.read()
+
+    assert result["content"] == plain["content"] == content
+    assert result["wire_bytes"] < len(content) // 4
+    assert result["disk_bytes"] < len(content) // 4
+    assert plain["disk_bytes"] == len(content)
+    assert (tmp_path / "files.json").read_bytes() == content
+    assert not (tmp_path / "files.json.gz").exists()
+
+
+def test_download_specs_conditional_cache(tmp_path, base_url, spec_server):
+    """Test that a warm cache revalidates and reuses the cached bodies."""
+    cache_dir = str(tmp_path / "_cache")
+
+    cold = download_specs(str(tmp_path), base_url=base_url, cache_dir=cache_dir)
+    assert sorted(spec_server.status_codes) == [200] * len(SPEC_NAMES)
+    assert (tmp_path / "_cache" / "files.meta.json").exists()
+
+    spec_server.status_codes.clear()
+    warm = download_specs(str(tmp_path), base_url=base_url, cache_dir=cache_dir)
+    assert spec_server.status_codes == [304] * len(SPEC_NAMES)
+    assert warm == cold
+
+
+def test_load_specs():
+    """Test loading the specifications from a local directory."""
+    specs = load_specs(SPECS_DIR)
+
+    assert list(specs) == SPEC_NAMES
+    assert "schemas" in specs["assets"]["components"]
+
+
+def test_parse_spec_plain_dicts():
+    """Test that specifications are parsed into plain dicts."""
+    spec = parse_spec("test", b'{"b": {"y": 1, "x": 2}, "a": []}', True)
+
+    assert type(spec["b"]) is dict  # pylint: disable=unidiomatic-typecheck
+    assert list(spec) == ["b", "a"]
+    assert list(spec["b"]) == ["y", "x"]
+
+
+def test_parse_spec_parsed_cache(tmp_path, fixture_specs):
+    """Test that warm parses load the parsed-spec cache entry."""
+    parsed_cache_dir = str(tmp_path)
+    content = read_spec_file(SPECS_DIR, "files")
+    digest = hashlib.sha256(content).hexdigest()
+
+    cold = parse_spec("files", content, parsed_cache_dir=parsed_cache_dir)
+    cached = read_parsed_spec(parsed_cache_dir, "files", digest)
+    warm = parse_spec("files", content, parsed_cache_dir=parsed_cache_dir)
+
+    assert cold == cached == warm == fixture_specs["files"]
+    assert [path.name for path in tmp_path.iterdir()] == [
+        f"files.{digest}.{sys.implementation.cache_tag}.marshal"
+    ]
+
+    parse_spec("files", b'{"changed": true}', parsed_cache_dir=parsed_cache_dir)
+    assert read_parsed_spec(parsed_cache_dir, "files", digest) is None
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_main_offline(tmp_path):
+    """Test that an offline run generates the package without requests."""
+    output_dir = tmp_path / "models"
+    script = (
+        "import sys; import generate_iconik_models as g; "
+        "sys.exit(g.main() or 'requests' in sys.modules)"
+    )
+
+    subprocess.run(
+        [sys.executable, "-c", script, "--spec-dir", SPECS_DIR, "-o",
+         str(output_dir)],
+        check=True,
+        cwd=ROOT_DIR,
+        env={**os.environ, "PYTHONPATH": os.path.join(ROOT_DIR, "src")},
+    )
+
+    assert (output_dir / "__init__.py").exists()
+    assert (output_dir / "users_notifications.py").exists()
+    assert not (output_dir / "_specs").exists()
+
+    sources = generate(load_specs(SPECS_DIR))
+    assert sorted(
+        path.name for path in output_dir.iterdir() if path.suffix == ".py"
+    ) == list(sources)
+    for module_path, source in sources.items():
+        assert (output_dir / module_path).read_text() == source
+
+
+def test_generate_keeps_unknown_specs(fixture_specs):
+    """Test that specifications missing from SPEC_NAMES are generated last."""
+    specs = {
+        "custom": fixture_specs["assets"],
+        "files": fixture_specs["files"],
+        "assets": fixture_specs["assets"],
+    }
+
+    sources = generate(specs)
+
+    assert list(sources) == ["__init__.py", "assets.py", "custom.py", "files.py"]
+    assert "class " in sources["custom.py"]
+    assert [
+        line for line in sources["__init__.py"].splitlines()
+        if line.startswith("from . import")
+    ] == [
+        "from . import files",
+        "from . import assets",
+        "from . import custom",
+    ]
+
+
+def test_collect_model_dependencies_exact():
+    """Test that dependencies follow `$ref` targets, not name substrings."""
+    ref = "#/components/schemas/{}".format
+    schemas = {
+        "User": {"type": "object", "properties": {"name": {"type": "string"}}},
+        "UserSchema": {
+            "type": "object",
+            "properties": {
+                "owner": {"$ref": ref("Owner")},
+                "tags": {"type": "array", "items": {"$ref": ref("Tag")}},
+                "labels": {
+                    "type": "object",
+                    "additionalProperties": {"$ref": ref("Tag")},
+                },
+            },
+        },
+        "Owner": {
+            "type": "object",
+            "properties": {"user": {"$ref": ref("User")}},
+        },
+        "Tag": {"type": "object", "properties": {}},
+        "Principal": {"oneOf": [{"$ref": ref("User")}, {"type": "string"}]},
+    }
+
+    dependencies = collect_model_dependencies(
+        generate_spec_models(schemas)
+    )
+
+    assert dependencies == {
+        "User": set(),
+        "UserSchema": {"Owner", "Tag"},
+        "Owner": {"User"},
+        "Tag": set(),
+        "Principal": {"User"},
+    }
+
+    # Names that only occur inside other identifiers are not dependencies
+    bee = TypeRef("Bee", (), None, True, True)
+    assert collect_model_dependencies([
+        Model("A", "", {"b": Field("b", bee, False, "None")}, {}, None),
+        Model("B", "", {}, {}, None),
+        Model("Bee", "", {}, {}, None),
+    ])["A"] == {"Bee"}
+
+
+def test_model_representation():
+    """Test that type trees render the type hints of the former strings."""
+    ref = "#/components/schemas/{}".format
+    schemas = {
+        "Asset": {
+            "type": "object",
+            "properties": {
+                "status": {"type": "string", "enum": ["OPEN", "CLOSED"]},
+                "files": {"type": "array", "items": {"$ref": ref("File")}},
+                "x-meta": {
+                    "type": "object",
+                    "additionalProperties": {"type": "integer"},
+                },
+                "from": {"type": "string", "format": "date-time"},
+            },
+            "required": ["files"],
+        },
+        "File": {"type": "object", "properties": {}},
+        "Source": {"anyOf": [{"$ref": ref("File")}, {"type": "string"}]},
+    }
+
+    models = {
+        model.name: model for model in generate_spec_models(schemas)
+    }
+
+    fields = models["Asset"].fields
+    assert {name: field.render() for name, field in fields.items()} == {
+        "status": "Optional[Literal['OPEN', 'CLOSED']]",
+        "files": "List[File]",
+        "x_meta": "Optional[Dict[str, int]]",
+        "from_": "Optional[datetime]",
+    }
+    assert fields["files"].default is None
+    assert fields["x_meta"].default == (
+        'Field(default_factory=dict, alias="x-meta")'
+    )
+    assert isinstance(fields["status"].annotation, TypeLiteral)
+    assert models["Source"].type_alias == TypeUnion((
+        TypeRef("File", (), None, True, False),
+        TypeRef("str", (), None, False, False),
+    ))
+    assert [ref.name for ref in models["Source"].iter_refs()] == ["File"]
+
+
+def test_type_mapping_overrides(tmp_path):
+    """Test that overrides replace (type, format) entries and their imports."""
+    defaults = TypeMapping()
+    assert defaults.lookup("string", "uri").render() == "HttpUrl"
+    assert defaults.lookup("string", "password").render() == "str"
+    assert defaults.lookup("integer", "int64").render() == "int"
+    assert defaults.lookup("array").render() == "Any"
+    assert defaults.digest() == ""
+
+    path = tmp_path / "types.json"
+    path.write_text(json.dumps({
+        "string:uri": "str",
+        "string:date-time": "pydantic.AwareDatetime",
+        "number": "decimal.Decimal",
+    }))
+    type_mapping = TypeMapping.from_file(str(path))
+    assert type_mapping.lookup("number", "double").imports == {
+        ("decimal", "Decimal")
+    }
+    assert type_mapping.digest() != defaults.digest()
+
+    schemas = {
+        "Asset": {
+            "type": "object",
+            "properties": {
+                "url": {"type": "string", "format": "uri"},
+                "links": {
+                    "type": "array",
+                    "items": {"type": "string", "format": "uri"},
+                },
+                "created": {"type": "string", "format": "date-time"},
+            },
+        },
+    }
+    model, = generate_spec_models(schemas, type_mapping=type_mapping)
+    assert {name: field.render() for name, field in model.fields.items()} == {
+        "url": "Optional[str]",
+        "links": "Optional[List[str]]",
+        "created": "Optional[AwareDatetime]",
+    }
+    assert ("pydantic", "HttpUrl") not in model.imports
+    assert ("pydantic", "AwareDatetime") in model.imports
+
+    for content in ("[]", '{"string": 1}', '{"string": "no-type"}'):
+        path.write_text(content)
+        with pytest.raises(ValueError):
+            TypeMapping.from_file(str(path))
+
+
+def test_create_module_file_imports(tmp_path):
+    """Test that modules import exactly the symbols their fields record."""
+    ref = "#/components/schemas/{}".format
+    schemas = {
+        "UpdateSchema": {
+            "type": "object",
+            "properties": {"date_updated": {"type": "string"}},
+            "required": ["date_updated"],
+        },
+        "Update": {
+            "type": "object",
+            "properties": {
+                "update": {"$ref": ref("UpdateSchema")},
+                "created": {"type": "string", "format": "date-time"},
+            },
+        },
+    }
+    models = generate_spec_models(schemas)
+
+    assert models[0].imports == {("pydantic", "BaseModel")}
+    assert models[1].imports == {
+        ("pydantic", "BaseModel"),
+        ("datetime", "datetime"),
+        ("typing", "Optional"),
+    }
+
+    create_module_file("jobs", models, str(tmp_path))
+
+    lines = (tmp_path / "jobs.py").read_text().splitlines()
+    assert [line for line in lines if line.startswith("from ")] == [
+        "from __future__ import annotations",
+        "from datetime import datetime",
+        "from pydantic import BaseModel",
+        "from typing import Optional",
+    ]
+
+
+def test_emitters_identical(tmp_path, fixture_specs):
+    """Test that the template and the direct emitter write the same code."""
+    schemas = extract_schemas(fixture_specs)
+    models_by_spec = generate_models(schemas)
+    bytecode_cache_dir = str(tmp_path / "templates")
+
+    for spec_name, models in models_by_spec.items():
+        rendered = io.StringIO()
+        render_model_code(models, rendered, bytecode_cache_dir)
+        emitted = io.StringIO()
+        emit_model_code(models, emitted)
+        assert emitted.getvalue() == rendered.getvalue(), spec_name
+
+    assert os.listdir(bytecode_cache_dir)
+
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    create_module_file("jobs", models_by_spec["jobs"], str(tmp_path / "a"))
+    create_module_file(
+        "jobs", models_by_spec["jobs"], str(tmp_path / "b"),
+        emit_models=emit_model_code,
+    )
+    assert (tmp_path / "a" / "jobs.py").read_bytes() == (
+        tmp_path / "b" / "jobs.py"
+    ).read_bytes()
+
+
+def test_source_writer_skips_unchanged(tmp_path):
+    """Test that identical files keep their mtime and changes are atomic."""
+    path = tmp_path / "jobs.py"
+    assert write_source_file(str(tmp_path), "jobs.py", "A = 1\n")
+    os.utime(path, (0, 0))
+
+    assert not write_source_file(str(tmp_path), "jobs.py", "A = 1\n")
+    assert path.stat().st_mtime == 0
+
+    writer = SourceWriter(str(tmp_path), str(tmp_path / "_staging"))
+    writer("jobs.py", "A = 1\n")
+    writer("files.py", "B = 2\n")
+    assert not (tmp_path / "files.py").exists()
+    writer.publish()
+
+    assert writer.written == ["files.py"]
+    assert writer.unchanged == ["jobs.py"]
+    assert path.stat().st_mtime == 0
+    assert (tmp_path / "files.py").read_text() == "B = 2\n"
+    assert sorted(os.listdir(tmp_path)) == ["files.py", "jobs.py"]
+
+
+def test_sort_models_by_dependency_deep_chain():
+    """Test that long reference chains are ordered without recursion."""
+    size = sys.getrecursionlimit() * 2
+    models = [
+        Model(
+            f"Model{i}",
+            "",
+            {"next": Field(
+                "next",
+                TypeRef(f"Model{i + 1}", (), None, True, True),
+                True,
+                None,
+            )},
+            {},
+            None,
+        )
+        for i in range(size)
+    ]
+
+    sorted_models = sort_models_by_dependency(models)
+
+    assert [model.name for model in sorted_models] == [
+        f"Model{i}" for i in reversed(range(size))
+    ]
+
+
+def test_find_model_components_cycles(caplog):
+    """Test that cyclic groups are reported and ordered after their deps."""
+    dependencies = {
+        "Folder": {"Asset", "Base"},
+        "Asset": {"Folder", "Base"},
+        "Base": set(),
+        "Node": {"Node", "Leaf"},
+        "Leaf": set(),
+    }
+
+    components = find_model_components(list(dependencies), dependencies)
+
+    assert components == [["Base"], ["Folder", "Asset"], ["Leaf"], ["Node"]]
+
+    models = [
+        Model(name, "", {}, {}, TypeUnion(tuple(
+            TypeRef(dep, (), None, True, True) for dep in sorted(deps)
+        )))
+        for name, deps in dependencies.items()
+    ]
+    with caplog.at_level("INFO"):
+        sort_models_by_dependency(models)
+    assert "1 cyclic model group(s)" in caplog.text
+    assert "Folder <-> Asset" in caplog.text
+
+
+def test_forward_references_only_in_cycles():
+    """Test that only references within cycles are deferred."""
+    ref = "#/components/schemas/{}".format
+    schemas = {
+        "Folder": {
+            "type": "object",
+            "properties": {
+                "assets": {"type": "array", "items": {"$ref": ref("Asset")}},
+                "parent": {"$ref": ref("Folder")},
+            },
+        },
+        "Asset": {
+            "type": "object",
+            "properties": {"folder": {"$ref": ref("Folder")}},
+        },
+        "Page": {
+            "type": "object",
+            "properties": {
+                "objects": {"type": "array", "items": {"$ref": ref("Asset")}},
+            },
+        },
+    }
+
+    models = generate_spec_models(schemas)
+    fields = {
+        (model.name, name): field.render()
+        for model in models
+        for name, field in model.fields.items()
+    }
+
+    assert fields == {
+        ("Folder", "assets"): "Optional[List['Asset']]",
+        ("Folder", "parent"): "Optional['Folder']",
+        ("Asset", "folder"): "Optional['Folder']",
+        ("Page", "objects"): "Optional[List[Asset]]",
+    }
+    source = render_module("assets", models)
+    assert source.endswith(
+        "# Update forward references\n"
+        "Folder.model_rebuild()\n"
+        "Asset.model_rebuild()\n"
+    )
+
+
+def test_type_alias_quotes_undefined_members(tmp_path):
+    """Test that alias members without a model are quoted so imports work."""
+    ref = "#/components/schemas/{}".format
+    schemas = {
+        "Status": {"type": "string", "enum": ["open", "closed"]},
+        "Item": {
+            "type": "object",
+            "properties": {"title": {"type": "string"}},
+        },
+        "Entry": {"oneOf": [{"$ref": ref("Status")}, {"$ref": ref("Item")}]},
+    }
+
+    models = generate_spec_models(schemas)
+    source = render_module("entries", models)
+    assert "Entry = Union['Status', Item]" in source
+
+    (tmp_path / "entries.py").write_text(source)
+    subprocess.run(
+        [sys.executable, "-c", "import entries"], cwd=tmp_path, check=True
+    )
+
+
+def test_resolve_schema_references_cycles():
+    """Test that cyclic references are left in place as `$ref` markers."""
+    ref = "#/components/schemas/{}".format
+    schemas = {
+        "Folder": {
+            "type": "object",
+            "properties": {
+                "parent": {"$ref": ref("Folder")},
+                "assets": {"type": "array", "items": {"$ref": ref("Asset")}},
+            },
+        },
+        "Asset": {
+            "type": "object",
+            "properties": {"folder": {"$ref": ref("Folder")}},
+        },
+    }
+
+    resolved = resolve_schema_references({"$ref": ref("Asset")}, schemas)
+
+    folder = resolved["properties"]["folder"]
+    assert folder["properties"]["parent"] == {"$ref": ref("Folder")}
+    assert folder["properties"]["assets"]["items"] == {"$ref": ref("Asset")}
+
+
+def test_resolve_schema_references_cycle_memo():
+    """Test that results cut short by a cycle are not memoized."""
+    ref = "#/components/schemas/{}".format
+    schemas = {
+        "Folder": {"properties": {"asset": {"$ref": ref("Asset")}}},
+        "Asset": {"properties": {"folder": {"$ref": ref("Folder")}}},
+    }
+    memo = {}
+
+    resolve_schema_references({"$ref": ref("Folder")}, schemas, memo)
+
+    # Asset was cut short at Folder, which it inlines when resolved alone
+    assert memo == {
+        "Folder": {
+            "properties": {
+                "asset": {"properties": {"folder": {"$ref": ref("Folder")}}},
+            },
+        },
+    }
+
+
+def test_resolve_schema_references_memo(fixture_specs):
+    """Test that the memo is reused and shared results match copies."""
+    schemas = fixture_specs["files"]["components"]["schemas"]
+    memo = {}
+
+    copies = {
+        name: resolve_schema_references(schema, schemas, memo)
+        for name, schema in schemas.items()
+    }
+    memo_size = len(memo)
+    shared = {
+        name: resolve_schema_references(schema, schemas, memo, share=True)
+        for name, schema in schemas.items()
+    }
+
+    assert len(memo) == memo_size > 0
+    assert shared == copies
+    ref_name = next(iter(memo))
+    assert resolve_schema_references(
+        {"$ref": f"#/components/schemas/{ref_name}"}, schemas, memo, True
+    ) is memo[ref_name]
+    assert resolve_schema_references(
+        {"$ref": f"#/components/schemas/{ref_name}"}, schemas, memo
+    ) is not memo[ref_name]
+
+
+def test_flatten_all_of():
+    """Test that allOf compositions merge their bases once."""
+    ref = "#/components/schemas/{}".format
+    schemas = {
+        "Base": {
+            "type": "object",
+            "description": "Base",
+            "properties": {"id": {"type": "string"}},
+            "required": ["id"],
+        },
+        "Named": {
+            "allOf": [
+                {"$ref": ref("Base")},
+                {"properties": {"name": {"type": "string"}},
+                 "required": ["name", "id"]},
+            ],
+        },
+        "Folder": {
+            "allOf": [{"$ref": ref("Named")}],
+            "description": "Folder",
+            "properties": {
+                "owner": {"allOf": [{"$ref": ref("Named")}], "readOnly": True},
+            },
+        },
+    }
+    memo = {}
+
+    flattened = flatten_all_of(schemas, memo)
+
+    assert flattened["Base"] is schemas["Base"]
+    assert flattened["Named"] is memo["Named"]
+    assert flattened["Named"] == {
+        "type": "object",
+        "properties": {"id": {"type": "string"}, "name": {"type": "string"}},
+        "required": ["id", "name"],
+    }
+    assert list(flattened["Folder"]["properties"]) == ["id", "name", "owner"]
+    assert flattened["Folder"]["description"] == "Folder"
+    assert flattened["Folder"]["properties"]["owner"] == {
+        "readOnly": True, "$ref": ref("Named")
+    }
+
+    models = {
+        model.name: model for model in generate_spec_models(schemas)
+    }
+    assert models["Folder"].fields["owner"].render() == "Optional[Named]"
+    assert models["Folder"].fields["name"].default is None
+
+
+def test_flatten_all_of_unknown_base(caplog):
+    """Test that allOf bases missing from the specification are reported."""
+    schemas = {
+        "Folder": {
+            "allOf": [
+                {"$ref": "#/components/schemas/Missing"},
+                {"properties": {"name": {"type": "string"}}},
+            ],
+        },
+    }
+
+    with caplog.at_level("WARNING"):
+        flattened = flatten_all_of(schemas)
+
+    assert flattened["Folder"] == {
+        "type": "object", "properties": {"name": {"type": "string"}}
+    }
+    assert "#/components/schemas/Missing" in caplog.text
+
+
+def test_find_shared_schemas():
+    """Test structural matching that ignores descriptions and key order."""
+    ref = "#/components/schemas/{}".format
+    page = {"type": "object", "properties": {"page": {"type": "integer"}}}
+    item = {
+        "type": "object",
+        "description": "An item",
+        "properties": {
+            "description": {"type": "string"},
+            "kind": {"type": "string", "description": "Kind"},
+        },
+    }
+    schemas = {
+        "files": {"Page": page, "Item": item,
+                  "Owner": {"type": "object", "properties": {}}},
+        "assets": {
+            "Page": {"properties": dict(page["properties"]), "type": "object"},
+            "Item": {
+                "type": "object",
+                "properties": {
+                    "description": {"type": "string"},
+                    "kind": {"type": "string"},
+                },
+            },
+            "Owner": {"type": "object", "properties": {}},
+        },
+        "jobs": {
+            "Page": page,
+            "Item": {"type": "object", "properties": {"kind": {}}},
+        },
+    }
+    for spec_name in ("files", "assets"):
+        schemas[spec_name]["Folder"] = {
+            "type": "object",
+            "properties": {"owner": {"$ref": ref("Owner")}},
+        }
+    schemas["jobs"]["Folder"] = schemas["files"]["Folder"]
+
+    shared = find_shared_schemas(schemas)
+
+    assert shared == {
+        "Page": ["files", "assets", "jobs"],
+        "Item": ["files", "assets"],
+        "Owner": ["files", "assets"],
+        # jobs has no Owner, so its Folder cannot use the shared one
+        "Folder": ["files", "assets"],
+    }
+
+
+def test_run_sequential_shared_models(tmp_path, fixture_specs):
+    """Test that shared models are written once and re-exported."""
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+    (models_dir / "__init__.py").write_text("")
+
+    specs, generated = run_sequential(
+        iter(fixture_specs.items()),
+        functools.partial(write_source_file, str(models_dir)),
+        shared_models=True,
+    )
+
+    shared = find_shared_schemas(extract_schemas(specs))
+    assert "_common" in generated
+    assert "BulkActionSchema" in shared
+    common = (models_dir / "_common.py").read_text()
+    assert "class BulkActionSchema(BaseModel)" in common
+    files = (models_dir / "files.py").read_text()
+    assert "class BulkActionSchema(" not in files
+    assert "    BulkActionSchema,\n" in files
+
+    script = (
+        "from models import assets, files; "
+        "assert files.BulkActionSchema is assets.BulkActionSchema"
+    )
+    subprocess.run(
+        [sys.executable, "-c", script], check=True, cwd=str(tmp_path)
+    )
+
+
+def test_run_pipeline_matches_sequential(fixture_specs):
+    """Test that pipelined output is identical to the sequential path."""
+    sequential_sources = {}
+    pipeline_sources = {}
+
+    specs, generated = run_sequential(
+        iter(fixture_specs.items()), sequential_sources.__setitem__
+    )
+    pipeline_specs, pipeline_generated = run_pipeline(
+        reversed(list(fixture_specs.items())), pipeline_sources.__setitem__
+    )
+
+    assert list(pipeline_specs) == list(specs) == SPEC_NAMES
+    assert pipeline_generated == generated
+    assert pipeline_sources == sequential_sources
+
+
+@pytest.mark.parametrize("shared_models", [False, True])
+def test_generate_jobs_matches_serial(fixture_specs, shared_models):
+    """Test that a process pool generates byte-identical sources."""
+    serial = generate(fixture_specs, shared_models)
+    parallel = generate(fixture_specs, shared_models, jobs=3)
+
+    assert list(parallel) == list(serial)
+    assert parallel == serial
+
+
+def test_run_low_memory(tmp_path):
+    """Test that low-memory mode matches the sequential path with less peak."""
+    sequential_dir = tmp_path / "sequential"
+    low_memory_dir = tmp_path / "low_memory"
+    sequential_dir.mkdir()
+    low_memory_dir.mkdir()
+
+    tracemalloc.start()
+    try:
+        generated = run_sequential(
+            iter_loaded_specs(SPECS_DIR),
+            functools.partial(write_source_file, str(sequential_dir)),
+        )[1]
+        sequential_peak = tracemalloc.get_traced_memory()[1]
+
+        tracemalloc.reset_peak()
+        headers, low_memory_generated = run_low_memory(
+            iter_loaded_specs(SPECS_DIR),
+            functools.partial(write_source_file, str(low_memory_dir)),
+        )
+        low_memory_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert low_memory_peak < sequential_peak
+    assert low_memory_generated == generated
+    assert list(headers) == SPEC_NAMES
+    assert set(headers["files"]) == {"info", "openapi"}
+    for path in sequential_dir.iterdir():
+        assert (low_memory_dir / path.name).read_bytes() == path.read_bytes()
+
+
+def test_main_resume(tmp_path, base_url, monkeypatch, spec_server):
+    """Test that --resume only redoes the specification that failed."""
+    output_dir = tmp_path / "models"
+    argv = ["generate-iconik-models", "-o", str(output_dir), "--base-url",
+            base_url, "--no-cache"]
+
+    spec_server.fail_specs = frozenset({"jobs"})
+    monkeypatch.setattr(sys, "argv", argv)
+    assert main() == 1
+
+    manifest = json.loads((output_dir / "_manifest.json").read_text())
+    assert manifest["specs"]["jobs"] == {"status": "failed"}
+    assert manifest["specs"]["files"]["status"] == "fetched"
+    assert "jobs" not in manifest["modules"]
+    assert not (output_dir / "jobs.py").exists()
+    assert (output_dir / "_specs" / "files.json.gz").exists()
+
+    spec_server.fail_specs = frozenset()
+    spec_server.status_codes.clear()
+    monkeypatch.setattr(sys, "argv", [*argv, "--resume"])
+    assert main() == 0
+
+    assert spec_server.status_codes == [200]
+    assert (output_dir / "jobs.py").exists()
+    assert "from . import jobs" in (output_dir / "__init__.py").read_text()
+    assert not (output_dir / "_specs").exists()
+
+
+def test_main_incremental(tmp_path, monkeypatch):
+    """Test that only modules whose inputs changed are regenerated."""
+    spec_dir = tmp_path / "_specs"
+    shutil.copytree(SPECS_DIR, spec_dir)
+    output_dir = tmp_path / "models"
+    monkeypatch.setattr(sys, "argv", [
+        "generate-iconik-models", "--spec-dir", str(spec_dir), "-o",
+        str(output_dir), "--no-cache",
+    ])
+    assert main() == 0
+
+    for path in output_dir.glob("*.py"):
+        os.utime(path, (0, 0))
+    assert main() == 0
+    assert {path.stat().st_mtime for path in output_dir.glob("*.py")} == {0}
+
+    spec = json.loads((spec_dir / "jobs.json").read_text())
+    spec["paths"] = {}
+    spec["components"]["schemas"]["JobSchema"]["description"] = "Changed"
+    (spec_dir / "jobs.json").write_text(json.dumps(spec))
+    assert main() == 0
+
+    changed = {
+        path.name for path in output_dir.glob("*.py")
+        if path.stat().st_mtime != 0
+    }
+    assert changed == {"jobs.py"}
+    assert '"""Changed"""' in (output_dir / "jobs.py").read_text()
+
+    manifest = json.loads((output_dir / "_manifest.json").read_text())
+    assert "__init__" in manifest["modules"]
+    assert all("inputs" in entry for entry in manifest["modules"].values())
+
+
+def test_main_incremental_shared_enum(tmp_path, monkeypatch):
+    """Test that a warm run imports only the models the shared module has."""
+    spec_dir = tmp_path / "_specs"
+    spec_dir.mkdir()
+    for position, spec_name in enumerate(SPEC_NAMES):
+        schemas = {f"Item{position}": {
+            "type": "object", "properties": {"id": {"type": "string"}},
+        }}
+        if spec_name in ("files", "jobs"):
+            schemas["Status"] = {"type": "string", "enum": ["OPEN", "DONE"]}
+            schemas["Obj"] = {
+                "type": "object", "properties": {"name": {"type": "string"}},
+            }
+        (spec_dir / f"{spec_name}.json").write_text(json.dumps({
+            "openapi": "3.0.0",
+            "info": {"title": spec_name, "version": "1"},
+            "components": {"schemas": schemas},
+        }))
+    output_dir = tmp_path / "models"
+    monkeypatch.setattr(sys, "argv", [
+        "generate-iconik-models", "--spec-dir", str(spec_dir), "-o",
+        str(output_dir), "--no-cache", "--shared-models",
+    ])
+
+    for _ in range(2):
+        assert main() == 0
+        assert "Status" not in (output_dir / "files.py").read_text()
+        assert "    Obj,\n" in (output_dir / "jobs.py").read_text()
+        subprocess.run(
+            [sys.executable, "-c", "import models"], cwd=tmp_path, check=True
+        )
+
+    manifest = json.loads((output_dir / "_manifest.json").read_text())
+    assert manifest["modules"]["_common"]["names"] == ["Obj"]
+
+
+def test_snapshot_store_skips_partial_runs(
+    tmp_path, base_url, monkeypatch, spec_server
+):
+    """Test that failed and resumed runs record no snapshot."""
+    store_dir = tmp_path / "snapshots"
+    output_dir = tmp_path / "models"
+    argv = ["generate-iconik-models", "--base-url", base_url, "--no-cache",
+            "--snapshot-store", str(store_dir), "-o", str(output_dir)]
+
+    spec_server.fail_specs = frozenset({"jobs"})
+    monkeypatch.setattr(sys, "argv", argv)
+    assert main() == 1
+    assert not (store_dir / "index.json").exists()
+
+    # The finished specifications of the failed run are not fetched again
+    spec_server.fail_specs = frozenset()
+    (output_dir / "_specs" / "files.json.gz").unlink()
+    monkeypatch.setattr(sys, "argv", [*argv, "--resume"])
+    assert main() == 0
+    assert not (store_dir / "index.json").exists()
+
+
+def test_snapshot_store(tmp_path, base_url, monkeypatch, spec_server):
+    """Test recording snapshots and generating from one offline."""
+    store_dir = tmp_path / "snapshots"
+    argv = ["generate-iconik-models", "--base-url", base_url, "--no-cache",
+            "--snapshot-store", str(store_dir)]
+
+    for run in ("first", "second"):
+        monkeypatch.setattr(sys, "argv", [*argv, "-o", str(tmp_path / run)])
+        assert main() == 0
+
+    index = json.loads((store_dir / "index.json").read_text())
+    assert len(index["snapshots"]) == 1
+    assert len(list((store_dir / "objects").glob("*/*.json.gz"))) == len(
+        SPEC_NAMES
+    )
+
+    snapshot = find_snapshot(str(store_dir), "latest")
+    assert find_snapshot(str(store_dir), snapshot["id"][:6]) == snapshot
+
+    spec_server.status_codes.clear()
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [*argv, "-o", str(tmp_path / "historical"), "--snapshot",
+         snapshot["id"]],
+    )
+    assert main() == 0
+
+    assert not spec_server.status_codes
+    assert (tmp_path / "historical" / "files.py").read_bytes() == (
+        tmp_path / "first" / "files.py"
+    ).read_bytes()